@@ -0,0 +1,272 @@
+"""
+Load test the BFF routes against in-process stubs of the downstream services.
+
+The app runs with its full middleware and client stack; only the network
+transport of each service client is replaced by a stub from `stubs.py`.
+For every scenario the throughput and p50/p95/p99 latencies are measured and
+written as JSON. With `--baseline` the results are compared to an earlier
+run and the script exits with status 1 when a route regressed by more than
+`--tolerance`.
+
+Usage:
+    PYTHONPATH=src python benchmarks/load.py --output results.json
+    PYTHONPATH=src python benchmarks/load.py --baseline results.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, NamedTuple
+
+import httpx
+from stubs import StubSettings, stub_transports
+
+SERVICES = ("account", "statement", "tag", "file")
+for _service in SERVICES:
+    os.environ.setdefault(
+        f"{_service.upper()}_SERVICE_URL", f"http://{_service}-service"
+    )
+# Keep sampled request logs out of the output; slow requests are still logged.
+os.environ.setdefault("REQUEST_LOG_SAMPLE_RATE", "0")
+# The upload scenario sends the same file every time, which would otherwise
+# only measure deduplication after the first request.
+os.environ.setdefault("UPLOAD_DEDUP", "false")
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    path: str
+    # Keyword arguments of `httpx.AsyncClient.request`.
+    kwargs: dict[str, Any]
+
+
+def build_scenarios(args: argparse.Namespace, ids: dict[str, str]) -> list[Scenario]:
+    csv_body = b"date,amount,description\n" + b"2025-01-01,100,x\n" * (
+        args.upload_size // 17
+    )
+    return [
+        Scenario("health", "GET", "/health", {}),
+        Scenario("list_accounts", "GET", "/api/v1/accounts/", {}),
+        Scenario("get_account", "GET", f"/api/v1/accounts/{ids['account']}", {}),
+        Scenario("list_tags", "GET", "/api/v1/tags/", {}),
+        Scenario("get_tag", "GET", f"/api/v1/tags/{ids['tag']}", {}),
+        Scenario(
+            "list_statements",
+            "GET",
+            "/api/v1/statements/",
+            {"params": {"limit": 100}},
+        ),
+        Scenario(
+            "list_statements_large",
+            "GET",
+            "/api/v1/statements/",
+            {"params": {"limit": args.page_size}},
+        ),
+        Scenario(
+            "export_statements",
+            "GET",
+            "/api/v1/statements/export",
+            {"params": {"format": "csv"}},
+        ),
+        Scenario("statement_analytics", "GET", "/api/v1/statements/analytics", {}),
+        Scenario(
+            "statement_timeseries",
+            "GET",
+            "/api/v1/statements/timeseries",
+            {"params": {"metric": "balance", "max_points": 500}},
+        ),
+        Scenario("get_statement", "GET", f"/api/v1/statements/{ids['statement']}", {}),
+        Scenario("list_raw_files", "GET", "/api/v1/files/raw", {}),
+        Scenario(
+            "batch_screen",
+            "POST",
+            "/api/v1/batch",
+            {
+                "json": {
+                    "requests": [
+                        {"path": "/api/v1/accounts/"},
+                        {"path": "/api/v1/tags/"},
+                        {"path": "/api/v1/statements/", "params": {"limit": 100}},
+                        {"path": f"/api/v1/accounts/{ids['account']}"},
+                    ]
+                }
+            },
+        ),
+        Scenario("dashboard", "GET", "/api/v1/dashboard", {}),
+        Scenario(
+            "upload_csv_large",
+            "POST",
+            "/api/v1/upload/csv",
+            {"files": {"csv_file": ("bench.csv", csv_body, "text/csv")}},
+        ),
+    ]
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    index = max(
+        0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1)
+    )
+    return sorted_values[index]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start_time = time.perf_counter()
+            response = await client.request(
+                scenario.method, scenario.path, **scenario.kwargs
+            )
+            latencies.append(time.perf_counter() - start_time)
+            if response.status_code >= 400:
+                errors += 1
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start_time
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    # The settings are read when the app is imported, so only after the
+    # environment above is set.
+    from finances_bff.main import app
+
+    stub_settings = StubSettings(
+        latency=args.latency, jitter=args.jitter, statements=args.statements
+    )
+    app.state.downstream_transports = stub_transports(stub_settings)
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bff", timeout=60
+        ) as client:
+            ids = {
+                "account": (await client.get("/api/v1/accounts/")).json()[0]["id"],
+                "tag": (await client.get("/api/v1/tags/")).json()[0]["id"],
+                "statement": (
+                    await client.get("/api/v1/statements/", params={"limit": 1})
+                ).json()[0]["id"],
+            }
+            for scenario in build_scenarios(args, ids):
+                if args.only and scenario.name not in args.only:
+                    continue
+                await run_scenario(client, scenario, args.warmup, args.concurrency)
+                results[scenario.name] = await run_scenario(
+                    client, scenario, args.requests, args.concurrency
+                )
+                print(f"{scenario.name}: {results[scenario.name]}", file=sys.stderr)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "settings": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("output", "baseline")
+            },
+        },
+        "routes": results,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """
+    List the routes whose p95 latency or throughput got worse than the
+    baseline by more than `tolerance`.
+    """
+    regressions = []
+    for name, result in current["routes"].items():
+        previous = baseline.get("routes", {}).get(name)
+        if previous is None:
+            continue
+        if result["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']}ms -> {result['p95_ms']}ms"
+            )
+        if result["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {previous['throughput_rps']}"
+                f" -> {result['throughput_rps']} rps"
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.002)
+    parser.add_argument("--statements", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=5_000)
+    parser.add_argument("--upload-size", type=int, default=20 * 1024 * 1024)
+    parser.add_argument("--only", nargs="*", help="Run only these scenarios")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with the results of a run")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), results, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
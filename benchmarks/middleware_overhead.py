@@ -0,0 +1,118 @@
+"""
+Measure the per-request overhead of the BFF middleware stack.
+
+Compares an app without middleware, the previous `@app.middleware("http")`
+functions (BaseHTTPMiddleware) and the pure ASGI middleware now used by
+`finances_bff.main`. Logging is silenced so only the middleware cost is
+measured.
+
+Usage:
+    PYTHONPATH=src python benchmarks/middleware_overhead.py [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+
+import finances_bff.middleware as middleware
+from finances_bff.middleware import ErrorHandlingMiddleware, RequestLoggingMiddleware
+from finances_bff.request_log import RequestLogWriter
+
+null_logger = logging.getLogger("benchmark")
+null_logger.disabled = True
+middleware.logger = null_logger
+logging.getLogger("httpx").setLevel(logging.WARNING)
+null_writer = RequestLogWriter(null_logger)
+
+
+def add_route(app: FastAPI) -> FastAPI:
+    @app.get("/items")
+    async def items():
+        return {"status": "ok"}
+
+    return app
+
+
+def plain_app() -> FastAPI:
+    return add_route(FastAPI())
+
+
+def base_http_middleware_app() -> FastAPI:
+    app = add_route(FastAPI())
+
+    @app.middleware("http")
+    async def log_response(request: Request, call_next):
+        start_time = time.perf_counter()
+        data = {
+            "url": str(request.url),
+            "method": request.method,
+            "headers": dict(request.headers),
+        }
+        response = await call_next(request)
+        data["process_time"] = time.perf_counter() - start_time
+        data["response"] = {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+        }
+        null_logger.info(data)
+        return response
+
+    @app.middleware("http")
+    async def handle_exceptions(request: Request, call_next):
+        try:
+            return await call_next(request)
+        except HTTPException as http_exception:
+            null_logger.error(f"HTTP exception: {http_exception.detail}")
+            return {"error": http_exception.detail}, http_exception.status_code
+        except Exception as e:
+            null_logger.error(f"Unhandled exception: {e}")
+            return {"error": "Internal Server Error"}, 500
+
+    return app
+
+
+def asgi_middleware_app() -> FastAPI:
+    app = add_route(FastAPI())
+    app.add_middleware(ErrorHandlingMiddleware)
+    app.add_middleware(RequestLoggingMiddleware, writer=null_writer)
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bff") as client:
+        for _ in range(100):
+            await client.get("/items")
+
+        start_time = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/items")
+        return (time.perf_counter() - start_time) / requests * 1_000_000
+
+
+async def main(requests: int) -> dict:
+    null_writer.start()
+    baseline = await measure(plain_app(), requests)
+    results = {"no_middleware_us": round(baseline, 2)}
+    for name, app in (
+        ("base_http_middleware", base_http_middleware_app()),
+        ("asgi_middleware", asgi_middleware_app()),
+    ):
+        per_request = await measure(app, requests)
+        results[f"{name}_us"] = round(per_request, 2)
+        results[f"{name}_overhead_us"] = round(per_request - baseline, 2)
+    null_writer.stop()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(main(args.requests)), indent=2))
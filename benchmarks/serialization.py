@@ -0,0 +1,113 @@
+"""
+Compare response serialization of a StatementExtended list.
+
+Measures, for a page of statements validated against the route's response
+model, the previous path (pydantic serialization to Python objects, then
+`json.dumps` in JSONResponse), the ORJSONResponse default now used by the
+app, and pydantic-core writing JSON bytes directly. The same comparison is
+also run end to end through a FastAPI route.
+
+Usage:
+    PYTHONPATH=src python benchmarks/serialization.py [--rows 1000]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from stubs import StubSettings, make_accounts, make_statements, make_tags
+
+from finances_bff.schemas.statement import StatementExtended
+
+statement_list = TypeAdapter(list[StatementExtended])
+
+
+def make_rows(rows: int) -> list[dict]:
+    settings = StubSettings(statements=rows)
+    rng = random.Random(settings.seed)
+    accounts = make_accounts(settings, rng)
+    tags = make_tags(settings, rng)
+    return make_statements(settings, rng, accounts, tags)
+
+
+def timed(function, repeat: int) -> float:
+    function()
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start_time) / repeat * 1000
+
+
+def serialization(rows: list[dict], repeat: int) -> dict:
+    statements = statement_list.validate_python(rows)
+    return {
+        "json_response_ms": timed(
+            lambda: JSONResponse(statement_list.dump_python(statements, mode="json")),
+            repeat,
+        ),
+        "orjson_response_ms": timed(
+            lambda: ORJSONResponse(statement_list.dump_python(statements, mode="json")),
+            repeat,
+        ),
+        "pydantic_dump_json_ms": timed(
+            lambda: statement_list.dump_json(statements), repeat
+        ),
+    }
+
+
+def route_app(rows: list[dict], response_class) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/statements/", response_model=list[StatementExtended])
+    async def statements():
+        return rows
+
+    return app
+
+
+async def end_to_end(rows: list[dict], repeat: int) -> dict:
+    results = {}
+    for name, response_class in (
+        ("json_response", JSONResponse),
+        ("orjson_response", ORJSONResponse),
+    ):
+        transport = httpx.ASGITransport(app=route_app(rows, response_class))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bff") as c:
+            bodies = [(await c.get("/statements/")).json()]
+            start_time = time.perf_counter()
+            for _ in range(repeat):
+                await c.get("/statements/")
+            results[f"{name}_route_ms"] = (
+                (time.perf_counter() - start_time) / repeat * 1000
+            )
+        results.setdefault("bodies", []).extend(bodies)
+
+    first, second = results.pop("bodies")
+    assert first == second, "Both response classes must produce the same JSON"
+    return results
+
+
+def main(rows: int, repeat: int) -> dict:
+    data = make_rows(rows)
+    results = {"rows": rows}
+    results.update(serialization(data, repeat))
+    results.update(asyncio.run(end_to_end(data, repeat)))
+    return {
+        key: round(value, 3) if isinstance(value, float) else value
+        for key, value in results.items()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(json.dumps(main(args.rows, args.repeat), indent=2))
@@ -0,0 +1,166 @@
+"""
+In-process stubs of the account, statement, tag and file services.
+
+Each stub is an `httpx.MockTransport`, so the BFF's clients run their full
+transport chain without any network I/O. Latency and payload sizes are
+configurable through `StubSettings`.
+"""
+
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+from pydantic import BaseModel
+
+
+class StubSettings(BaseModel):
+    # Time each stub takes to answer, in seconds, plus up to `jitter` more.
+    latency: float = 0.005
+    jitter: float = 0.002
+    accounts: int = 50
+    tags: int = 30
+    # Statements available to page through with `skip` and `limit`.
+    statements: int = 10_000
+    seed: int = 42
+
+
+def _stub_id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def make_accounts(settings: StubSettings, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "id": _stub_id(rng),
+            "name": f"Account {i}",
+            "iban": f"HU{i:026d}",
+            "nickname": f"account-{i}",
+            "parent_id": None,
+            "aliases": [],
+        }
+        for i in range(settings.accounts)
+    ]
+
+
+def make_tags(settings: StubSettings, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "id": _stub_id(rng),
+            "name": f"tag-{i}",
+            "color": f"#{i * 4099 % 0xFFFFFF:06x}",
+        }
+        for i in range(settings.tags)
+    ]
+
+
+def make_statements(
+    settings: StubSettings,
+    rng: random.Random,
+    accounts: list[dict],
+    tags: list[dict],
+) -> list[dict]:
+    start = datetime(2025, 1, 1)
+    statements = []
+    for i in range(settings.statements):
+        account = accounts[i % len(accounts)]
+        counterparty = accounts[(i * 7 + 3) % len(accounts)]
+        date = (start - timedelta(hours=i * 3)).isoformat()
+        statements.append(
+            {
+                "id": _stub_id(rng),
+                "date": date,
+                "interest_date": date,
+                "amount": rng.randint(-500_000, 500_000),
+                "counterparty_iban": counterparty["iban"],
+                "counterparty_name": counterparty["name"],
+                "description": f"Card payment {i} " + "x" * rng.randint(0, 60),
+                "account_iban": account["iban"],
+                "account_name": account["name"],
+                "source_account": {
+                    key: account[key] for key in ("iban", "name", "nickname")
+                },
+                "destination_account": {
+                    key: counterparty[key] for key in ("iban", "name", "nickname")
+                },
+                "tags": [
+                    {key: tag[key] for key in ("id", "name", "color")}
+                    for tag in rng.sample(tags, k=min(2, len(tags)))
+                ],
+            }
+        )
+    return statements
+
+
+def stub_transports(settings: StubSettings) -> dict[str, httpx.AsyncBaseTransport]:
+    """
+    Build a stub transport for each downstream service.
+    """
+    rng = random.Random(settings.seed)
+    accounts = make_accounts(settings, rng)
+    tags = make_tags(settings, rng)
+    statements = make_statements(settings, rng, accounts, tags)
+    accounts_by_id = {account["id"]: account for account in accounts}
+    tags_by_key = {tag["id"]: tag for tag in tags} | {tag["name"]: tag for tag in tags}
+    statements_by_id = {statement["id"]: statement for statement in statements}
+
+    async def wait() -> None:
+        await asyncio.sleep(settings.latency + random.uniform(0, settings.jitter))
+
+    async def account_service(request: httpx.Request) -> httpx.Response:
+        await wait()
+        path = request.url.path
+        if path == "/health":
+            return httpx.Response(200, json={"status": "ok"})
+        if path == "/api/v1/accounts/":
+            return httpx.Response(200, json=accounts)
+        account = accounts_by_id.get(path.rsplit("/", 1)[-1])
+        if account is None:
+            return httpx.Response(404, json={"detail": "Account not found"})
+        return httpx.Response(200, json=account)
+
+    async def tag_service(request: httpx.Request) -> httpx.Response:
+        await wait()
+        path = request.url.path
+        if path == "/health":
+            return httpx.Response(200, json={"status": "ok"})
+        if path == "/api/v1/tags/":
+            return httpx.Response(200, json=tags)
+        tag = tags_by_key.get(path.rsplit("/", 1)[-1])
+        if tag is None:
+            return httpx.Response(404, json={"detail": "Tag not found"})
+        return httpx.Response(200, json=tag)
+
+    async def statement_service(request: httpx.Request) -> httpx.Response:
+        await wait()
+        path = request.url.path
+        if path == "/health":
+            return httpx.Response(200, json={"status": "ok"})
+        if path == "/api/v1/statements/":
+            skip = int(request.url.params.get("skip", 0))
+            limit = int(request.url.params.get("limit", 100))
+            return httpx.Response(200, json=statements[skip : skip + limit])
+        statement = statements_by_id.get(path.rsplit("/", 1)[-1])
+        if statement is None:
+            return httpx.Response(404, json={"detail": "Statement not found"})
+        return httpx.Response(200, json=statement)
+
+    async def file_service(request: httpx.Request) -> httpx.Response:
+        await wait()
+        path = request.url.path
+        if path == "/health":
+            return httpx.Response(200, json={"status": "ok"})
+        if path.startswith("/api/v1/upload/"):
+            body = await request.aread()
+            return httpx.Response(200, json={"received": len(body)})
+        if path == "/api/v1/files/raw":
+            return httpx.Response(200, json=[f"statement-{i}.csv" for i in range(20)])
+        return httpx.Response(200, json={"message": "ok"})
+
+    return {
+        "account": httpx.MockTransport(account_service),
+        "statement": httpx.MockTransport(statement_service),
+        "tag": httpx.MockTransport(tag_service),
+        "file": httpx.MockTransport(file_service),
+    }
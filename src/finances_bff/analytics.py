@@ -0,0 +1,111 @@
+from typing import AsyncIterator, Hashable, Iterable
+
+# Per group: count, sum, min, max, income, income count, expenses, expense count.
+COUNT, SUM, MIN, MAX, INCOME, INCOME_COUNT, EXPENSES, EXPENSE_COUNT = range(8)
+
+
+def new_stats(amount: int) -> list:
+    return [0, 0, amount, amount, 0, 0, 0, 0]
+
+
+def accumulate(
+    groups: dict[Hashable, list], keys: Iterable[Hashable], amounts: Iterable[int]
+) -> None:
+    """
+    Add a column of amounts to the stats of their groups.
+    """
+    for key, amount in zip(keys, amounts):
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = new_stats(amount)
+        stats[COUNT] += 1
+        stats[SUM] += amount
+        if amount < stats[MIN]:
+            stats[MIN] = amount
+        elif amount > stats[MAX]:
+            stats[MAX] = amount
+        if amount > 0:
+            stats[INCOME] += amount
+            stats[INCOME_COUNT] += 1
+        elif amount < 0:
+            stats[EXPENSES] += amount
+            stats[EXPENSE_COUNT] += 1
+
+
+def stats_dict(stats: list) -> dict:
+    return {
+        "count": stats[COUNT],
+        "sum": stats[SUM],
+        "min": stats[MIN],
+        "max": stats[MAX],
+        "income": stats[INCOME],
+        "income_count": stats[INCOME_COUNT],
+        "expenses": stats[EXPENSES],
+        "expense_count": stats[EXPENSE_COUNT],
+    }
+
+
+def group_list(groups: dict[Hashable, list]) -> list[dict]:
+    return [
+        {"key": key, **stats_dict(stats)}
+        for key, stats in sorted(
+            groups.items(), key=lambda item: (item[0] is None, item[0] or "")
+        )
+    ]
+
+
+class StatementAnalytics:
+    """
+    Sums, counts, minimums, maximums and income/expense splits of statements,
+    in total and by month, tag and account.
+
+    Pages are added one at a time and only the per-group stats are kept, so
+    memory does not depend on the number of statements. Each page is split
+    into columns first and every grouping makes one pass over its key column.
+    """
+
+    def __init__(self):
+        self.total: dict[Hashable, list] = {}
+        self.by_month: dict[Hashable, list] = {}
+        self.by_tag: dict[Hashable, list] = {}
+        self.by_account: dict[Hashable, list] = {}
+
+    def add_page(self, page: list[dict]) -> None:
+        if not page:
+            return
+        amounts = [statement["amount"] for statement in page]
+        # Dates are ISO 8601, so the first seven characters are the month.
+        months = [statement["date"][:7] for statement in page]
+        accounts = [statement.get("account_iban") for statement in page]
+        tag_names = [
+            [tag["name"] for tag in statement.get("tags") or ()] or [None]
+            for statement in page
+        ]
+
+        accumulate(self.total, [None] * len(amounts), amounts)
+        accumulate(self.by_month, months, amounts)
+        accumulate(self.by_account, accounts, amounts)
+        # A statement counts once for each of its tags; untagged ones are
+        # grouped under null.
+        accumulate(
+            self.by_tag,
+            [name for names in tag_names for name in names],
+            [
+                amount
+                for amount, names in zip(amounts, tag_names)
+                for _ in range(len(names))
+            ],
+        )
+
+    async def add_pages(self, pages: AsyncIterator[list[dict]]) -> None:
+        async for page in pages:
+            self.add_page(page)
+
+    def to_dict(self) -> dict:
+        total = self.total.get(None)
+        return {
+            "total": stats_dict(total or [0, 0, None, None, 0, 0, 0, 0]),
+            "by_month": group_list(self.by_month),
+            "by_tag": group_list(self.by_tag),
+            "by_account": group_list(self.by_account),
+        }
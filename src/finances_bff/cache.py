@@ -0,0 +1,99 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable
+
+
+class TTLCache:
+    """
+    Bounded in-process cache with a time-to-live and LRU eviction.
+
+    Entries can be stored in groups, for example the ids and names of the
+    records they contain. Invalidating a group removes every entry stored in
+    it, so a write can evict all the cached reads it affects.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any, frozenset]] = (
+            OrderedDict()
+        )
+        self._groups: dict[Hashable, set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Return the cached value, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, groups: Iterable[Hashable] = ()) -> None:
+        """
+        Store a value, evicting the least recently used entries when full.
+        """
+        self.delete(key)
+
+        groups = frozenset(groups)
+        self._entries[key] = (time.monotonic() + self.ttl, value, groups)
+        for group in groups:
+            self._groups.setdefault(group, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self.delete(oldest)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for group in entry[2]:
+            keys = self._groups.get(group)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._groups[group]
+
+    def invalidate(self, *groups: Hashable) -> None:
+        """
+        Remove every entry stored in any of the given groups.
+        """
+        for group in groups:
+            for key in list(self._groups.get(group, ())):
+                self.delete(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._groups.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,187 @@
+import os
+
+import httpx
+from pydantic import BaseModel
+
+from finances_bff.coalescing import CoalescingTransport
+from finances_bff.config import COALESCE_REQUESTS
+from finances_bff.metrics import MetricsTransport
+from finances_bff.resilience import ClosingStream, ResilienceTransport
+
+SERVICES = ("tag", "statement", "account", "file")
+
+
+class ServiceClientSettings(BaseModel):
+    """
+    Connection pool, timeout and resilience settings of a downstream service
+    client.
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 5.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 5.0
+    http2: bool = False
+
+    # Consecutive failures that open the circuit breaker, and how long it
+    # stays open before a trial request is let through.
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    # Retries of failed GET requests, with exponential backoff and jitter.
+    retry_attempts: int = 2
+    retry_backoff: float = 0.1
+    retry_backoff_max: float = 2.0
+    # Concurrent requests allowed to the service, and how long a request
+    # waits for a free slot before it is rejected.
+    max_concurrency: int = 100
+    bulkhead_timeout: float = 1.0
+
+    @classmethod
+    def from_env(cls, service: str) -> "ServiceClientSettings":
+        """
+        Read the settings of a service from `<SERVICE>_<SETTING>` variables,
+        for example `STATEMENT_MAX_CONNECTIONS` or `FILE_READ_TIMEOUT`.
+        """
+        prefix = service.upper()
+        values = {}
+        for name in cls.model_fields:
+            value = os.getenv(f"{prefix}_{name.upper()}")
+            if value:
+                values[name] = value
+        return cls(**values)
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+
+class PoolMonitorTransport(httpx.AsyncBaseTransport):
+    """
+    Track how busy the connection pool of a client is.
+
+    A request counts as in flight until its response is closed. Requests
+    started while all connections are in use have to wait for the pool and
+    are counted as saturated.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_connections: int):
+        self.transport = transport
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.saturated = 0
+        self.pool_timeouts = 0
+
+    def _release(self, error: BaseException | None = None) -> None:
+        self.in_flight -= 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.in_flight >= self.max_connections:
+            self.saturated += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException as e:
+            self._release()
+            if isinstance(e, httpx.PoolTimeout):
+                self.pool_timeouts += 1
+            raise
+
+        if response.is_closed:
+            # Responses with an in-memory body are already read and closed.
+            self._release()
+        else:
+            response.stream = ClosingStream(response.stream, self._release)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturated": self.saturated,
+            "pool_timeouts": self.pool_timeouts,
+        }
+
+
+def transport_stats(transport: httpx.AsyncBaseTransport) -> dict:
+    """
+    Collect the stats of every layer in a chain of wrapping transports.
+    """
+    stats = {}
+    while transport is not None:
+        if hasattr(transport, "stats"):
+            stats.update(transport.stats())
+        transport = getattr(transport, "transport", None)
+    return stats
+
+
+def create_service_transport(
+    service: str,
+    settings: ServiceClientSettings,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncBaseTransport:
+    """
+    Build the transport chain of a downstream service client.
+
+    `transport` replaces the network transport, for example with an
+    in-process stub of the service.
+    """
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(
+            limits=settings.limits, http2=settings.http2
+        )
+    transport = MetricsTransport(transport, service)
+    transport = PoolMonitorTransport(transport, settings.max_connections)
+    transport = ResilienceTransport(
+        transport,
+        failure_threshold=settings.breaker_failure_threshold,
+        reset_timeout=settings.breaker_reset_timeout,
+        retry_attempts=settings.retry_attempts,
+        retry_backoff=settings.retry_backoff,
+        retry_backoff_max=settings.retry_backoff_max,
+        max_concurrency=settings.max_concurrency,
+        bulkhead_timeout=settings.bulkhead_timeout,
+    )
+    if COALESCE_REQUESTS:
+        transport = CoalescingTransport(transport)
+    return transport
+
+
+def create_service_client(
+    service: str,
+    settings: ServiceClientSettings,
+    transport: httpx.AsyncBaseTransport,
+) -> httpx.AsyncClient:
+    """
+    Create the client of a downstream service, using `<SERVICE>_SERVICE_URL`.
+    """
+    url_variable = f"{service.upper()}_SERVICE_URL"
+    base_url = os.getenv(url_variable)
+    if not base_url:
+        raise ValueError(f"{url_variable} environment variable is not set")
+
+    return httpx.AsyncClient(
+        base_url=base_url, timeout=settings.timeout, transport=transport
+    )
@@ -0,0 +1,130 @@
+import asyncio
+from typing import NamedTuple
+
+import httpx
+
+from finances_bff.config import COALESCE_MAX_WAIT
+
+
+class _SharedResponse(NamedTuple):
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    content: bytes
+    extensions: dict
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            extensions=self.extensions,
+            request=request,
+        )
+
+
+class _LeaderCancelled(Exception):
+    pass
+
+
+def request_key(request: httpx.Request) -> tuple:
+    """
+    Identify a GET by its target and normalized query params. Credentials
+    are part of the key, so callers never share a response across users.
+    """
+    url = request.url
+    return (
+        url.scheme,
+        url.host,
+        url.port,
+        url.path,
+        tuple(sorted(url.params.multi_items())),
+        request.headers.get("authorization"),
+        request.headers.get("cookie"),
+    )
+
+
+class CoalescingTransport(httpx.AsyncBaseTransport):
+    """
+    Share one downstream call between identical concurrent GET requests.
+
+    The first request for a key makes the call and reads the body. Requests
+    with the same key arriving meanwhile wait for that result, for at most
+    `max_wait` seconds, and then make their own call. Nothing is kept after
+    the call finishes, so this never returns stale data.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, max_wait: float = COALESCE_MAX_WAIT
+    ):
+        self.transport = transport
+        self.max_wait = max_wait
+        self.coalesced = 0
+        self.coalesce_fallbacks = 0
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self.transport.handle_async_request(request)
+
+        key = request_key(request)
+        future = self._in_flight.get(key)
+        if future is not None:
+            return await self._follow(future, request)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            shared = await self._fetch(request)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.set_exception(_LeaderCancelled())
+            else:
+                future.set_exception(e)
+            # Mark the exception as retrieved when nobody was waiting for it.
+            future.exception()
+            raise
+        else:
+            future.set_result(shared)
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+        return shared.to_response(request)
+
+    async def _fetch(self, request: httpx.Request) -> _SharedResponse:
+        response = await self.transport.handle_async_request(request)
+        try:
+            content = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.stream.aclose()
+
+        return _SharedResponse(
+            response.status_code,
+            response.headers.raw,
+            content,
+            {
+                key: value
+                for key, value in response.extensions.items()
+                if key in ("http_version", "reason_phrase")
+            },
+        )
+
+    async def _follow(
+        self, future: asyncio.Future, request: httpx.Request
+    ) -> httpx.Response:
+        self.coalesced += 1
+        try:
+            shared = await asyncio.wait_for(asyncio.shield(future), self.max_wait)
+        except (asyncio.TimeoutError, _LeaderCancelled):
+            self.coalesce_fallbacks += 1
+            return await self.transport.handle_async_request(request)
+        return shared.to_response(request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "coalesced": self.coalesced,
+            "coalesce_fallbacks": self.coalesce_fallbacks,
+        }
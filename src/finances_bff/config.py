@@ -0,0 +1,231 @@
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    Read an integer setting from the environment, falling back to the default.
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    return int(value)
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """
+    Read a boolean setting from the environment, falling back to the default.
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def env_list(name: str, default: list[str]) -> list[str]:
+    """
+    Read a comma separated setting from the environment.
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def env_float(name: str, default: float) -> float:
+    """
+    Read a float setting from the environment, falling back to the default.
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    return float(value)
+
+
+# Size of the chunks read from an uploaded file and sent to the file service.
+# This is the upper bound of upload data held in memory per request.
+UPLOAD_CHUNK_SIZE = env_int("UPLOAD_CHUNK_SIZE", 64 * 1024)
+
+# Largest upload accepted by the BFF, enforced while the file is streamed.
+MAX_UPLOAD_SIZE = env_int("MAX_UPLOAD_SIZE", 512 * 1024 * 1024)
+
+# Files accepted by one /upload/bulk request, and how many of them are sent
+# to the file service at the same time.
+UPLOAD_BULK_MAX_FILES = env_int("UPLOAD_BULK_MAX_FILES", 50)
+UPLOAD_BULK_CONCURRENCY = env_int("UPLOAD_BULK_CONCURRENCY", 4)
+
+# Deadline in seconds for each downstream /health call made by GET /health.
+HEALTH_CHECK_TIMEOUTS = {
+    "account_service": env_float("ACCOUNT_HEALTH_TIMEOUT", 2.0),
+    "file_service": env_float("FILE_HEALTH_TIMEOUT", 2.0),
+    "statement_service": env_float("STATEMENT_HEALTH_TIMEOUT", 2.0),
+    "tag_service": env_float("TAG_HEALTH_TIMEOUT", 2.0),
+}
+
+# How long a GET /health result is reused before the services are checked again.
+HEALTH_CACHE_TTL = env_float("HEALTH_CACHE_TTL", 2.0)
+
+# In-process cache for tag reads, invalidated by tag writes.
+TAG_CACHE_TTL = env_float("TAG_CACHE_TTL", 300.0)
+TAG_CACHE_MAX_SIZE = env_int("TAG_CACHE_MAX_SIZE", 1024)
+
+# In-process cache for account reads, invalidated by account and alias writes.
+ACCOUNT_CACHE_TTL = env_float("ACCOUNT_CACHE_TTL", 60.0)
+ACCOUNT_CACHE_MAX_SIZE = env_int("ACCOUNT_CACHE_MAX_SIZE", 1024)
+
+# Routes whose downstream response body is forwarded without being parsed and
+# validated against the response model. "*" enables it for every route that
+# supports it, an empty value disables it.
+PASSTHROUGH_ROUTES = env_list("PASSTHROUGH_ROUTES", ["*"])
+
+# Debug mode: parse and validate every response against its response model,
+# even for the routes listed in PASSTHROUGH_ROUTES.
+VALIDATE_RESPONSES = env_bool("VALIDATE_RESPONSES", False)
+
+# Share of successful, fast requests that are logged. Errors and slow requests
+# are always logged.
+REQUEST_LOG_SAMPLE_RATE = env_float("REQUEST_LOG_SAMPLE_RATE", 0.01)
+REQUEST_LOG_SLOW_SECONDS = env_float("REQUEST_LOG_SLOW_SECONDS", 1.0)
+
+# Paths that are never logged, such as the health probes.
+REQUEST_LOG_EXCLUDE_PATHS = env_list(
+    "REQUEST_LOG_EXCLUDE_PATHS",
+    [
+        "/health",
+        "/account/health",
+        "/file/health",
+        "/statements/health",
+        "/tags/health",
+        "/metrics",
+    ],
+)
+
+# Request and response headers included in the log. Authorization and cookie
+# headers are redacted even when listed here.
+REQUEST_LOG_HEADERS = env_list(
+    "REQUEST_LOG_HEADERS",
+    ["user-agent", "content-type", "content-length", "x-request-id"],
+)
+
+# Records waiting for the log thread; new records are dropped when it is full.
+REQUEST_LOG_QUEUE_SIZE = env_int("REQUEST_LOG_QUEUE_SIZE", 10000)
+
+# Identical concurrent GETs to a downstream service share one call. Followers
+# wait at most COALESCE_MAX_WAIT seconds for it before making their own.
+COALESCE_REQUESTS = env_bool("COALESCE_REQUESTS", True)
+COALESCE_MAX_WAIT = env_float("COALESCE_MAX_WAIT", 5.0)
+
+# Response compression. Encodings are tried in this order of preference among
+# those the client accepts; br and zstd need the `compression` extra.
+COMPRESSION_ENCODINGS = env_list("COMPRESSION_ENCODINGS", ["br", "zstd", "gzip"])
+# Complete responses smaller than this many bytes are sent uncompressed.
+COMPRESSION_MIN_SIZE = env_int("COMPRESSION_MIN_SIZE", 1024)
+# Compression level of each encoding. The defaults favour speed over ratio.
+GZIP_LEVEL = env_int("GZIP_LEVEL", 6)
+BROTLI_QUALITY = env_int("BROTLI_QUALITY", 4)
+ZSTD_LEVEL = env_int("ZSTD_LEVEL", 3)
+# Compress streamed responses chunk by chunk, flushing after every chunk.
+COMPRESSION_STREAMING = env_bool("COMPRESSION_STREAMING", True)
+# Bodies or chunks of at least this many bytes are compressed in a worker
+# thread, so compressing a large page does not block the event loop.
+COMPRESSION_THREAD_SIZE = env_int("COMPRESSION_THREAD_SIZE", 256 * 1024)
+
+# Background /process jobs: how many run at once, how long a finished job's
+# result is kept, how many jobs are kept at most, and how often the events
+# stream sends a keepalive comment.
+PROCESS_MAX_CONCURRENCY = env_int("PROCESS_MAX_CONCURRENCY", 4)
+PROCESS_JOB_TTL = env_float("PROCESS_JOB_TTL", 3600.0)
+PROCESS_MAX_JOBS = env_int("PROCESS_MAX_JOBS", 1000)
+PROCESS_EVENTS_KEEPALIVE = env_float("PROCESS_EVENTS_KEEPALIVE", 15.0)
+
+# Skip sending files whose content was already uploaded. Uploads are tracked
+# by content hash in a local SQLite file holding at most
+# UPLOAD_DEDUP_MAX_ENTRIES files.
+UPLOAD_DEDUP = env_bool("UPLOAD_DEDUP", True)
+UPLOAD_DEDUP_PATH = os.getenv("UPLOAD_DEDUP_PATH", "upload_dedup.sqlite3")
+UPLOAD_DEDUP_MAX_ENTRIES = env_int("UPLOAD_DEDUP_MAX_ENTRIES", 10000)
+
+# Check the header and the first CSV_SAMPLE_ROWS rows of CSV uploads before
+# sending them to the file service. At most CSV_SNIFF_MAX_BYTES are read.
+CSV_PRECHECK = env_bool("CSV_PRECHECK", True)
+CSV_SAMPLE_ROWS = env_int("CSV_SAMPLE_ROWS", 20)
+CSV_SNIFF_MAX_BYTES = env_int("CSV_SNIFF_MAX_BYTES", 1024 * 1024)
+# Encodings tried, in order, for CSV files without a byte order mark. The
+# last one should accept any bytes.
+CSV_ENCODINGS = env_list("CSV_ENCODINGS", ["utf-8", "cp1250", "latin-1"])
+# Fewer columns than this usually means the delimiter was not recognised.
+CSV_MIN_COLUMNS = env_int("CSV_MIN_COLUMNS", 2)
+# Largest number of rows returned by /upload/csv/preview.
+CSV_PREVIEW_MAX_ROWS = env_int("CSV_PREVIEW_MAX_ROWS", 100)
+
+# Sub-requests accepted by one /batch call, and how many of them run at once.
+BATCH_MAX_REQUESTS = env_int("BATCH_MAX_REQUESTS", 20)
+BATCH_MAX_CONCURRENCY = env_int("BATCH_MAX_CONCURRENCY", 8)
+# Seconds a sub-request may take before it is cancelled and answered with 504.
+BATCH_REQUEST_TIMEOUT = env_float("BATCH_REQUEST_TIMEOUT", 10.0)
+# Names of the routes that can be called from /batch. Only routes answering
+# with a single JSON document belong here: streaming responses would be
+# buffered whole and uploads cannot be described in a JSON batch.
+BATCH_ROUTES = env_list(
+    "BATCH_ROUTES",
+    [
+        "read_accounts",
+        "read_account",
+        "create_account",
+        "create_alias",
+        "update_account",
+        "delete_account",
+        "read_dashboard",
+        "get_process_job",
+        "get_csv_files",
+        "list_statements",
+        "get_one_statement",
+        "create_statement",
+        "update_statement",
+        "delete_statement",
+        "statement_analytics",
+        "statement_timeseries",
+        "read_tags",
+        "read_tag",
+        "create_tag",
+        "update_tag",
+        "delete_tag",
+    ],
+)
+
+# Deadline in seconds for each section of GET /dashboard. A section that
+# fails or runs out of time is left empty; the others are still returned.
+DASHBOARD_SECTION_TIMEOUTS = {
+    "accounts": env_float("DASHBOARD_ACCOUNTS_TIMEOUT", 2.0),
+    "tags": env_float("DASHBOARD_TAGS_TIMEOUT", 2.0),
+    "recent_statements": env_float("DASHBOARD_STATEMENTS_TIMEOUT", 3.0),
+    "summary": env_float("DASHBOARD_SUMMARY_TIMEOUT", 5.0),
+}
+# The summary covers the last DASHBOARD_SUMMARY_DAYS days unless a period is
+# given, and sums at most DASHBOARD_SUMMARY_LIMIT statements.
+DASHBOARD_SUMMARY_DAYS = env_int("DASHBOARD_SUMMARY_DAYS", 30)
+DASHBOARD_SUMMARY_LIMIT = env_int("DASHBOARD_SUMMARY_LIMIT", 5000)
+# Complete dashboards are reused for this long per caller and filter set.
+DASHBOARD_CACHE_TTL = env_float("DASHBOARD_CACHE_TTL", 10.0)
+DASHBOARD_CACHE_MAX_SIZE = env_int("DASHBOARD_CACHE_MAX_SIZE", 256)
+
+# Statements requested per page while GET /statements/export, /analytics
+# and /timeseries page through the statement service. At most two
+# pages are held in memory.
+STATEMENT_EXPORT_PAGE_SIZE = env_int("STATEMENT_EXPORT_PAGE_SIZE", 1000)
+
+# Extra statements requested with each cursor page, so the rows sharing the
+# page's last date usually arrive in the same call.
+STATEMENT_CURSOR_OVERFETCH = env_int("STATEMENT_CURSOR_OVERFETCH", 20)
+# Fetch the next cursor page while the client renders the current one, and
+# keep it for STATEMENT_PREFETCH_TTL seconds. Statement writes drop them all.
+STATEMENT_PREFETCH = env_bool("STATEMENT_PREFETCH", True)
+STATEMENT_PREFETCH_TTL = env_float("STATEMENT_PREFETCH_TTL", 30.0)
+STATEMENT_PREFETCH_MAX_SIZE = env_int("STATEMENT_PREFETCH_MAX_SIZE", 256)
+
+# Results of GET /statements/analytics, cached by filter set. Statement writes
+# clear them.
+ANALYTICS_CACHE_TTL = env_float("ANALYTICS_CACHE_TTL", 300.0)
+ANALYTICS_CACHE_MAX_SIZE = env_int("ANALYTICS_CACHE_MAX_SIZE", 128)
+
+# Upper limit of the max_points parameter of GET /statements/timeseries.
+TIMESERIES_MAX_POINTS = env_int("TIMESERIES_MAX_POINTS", 5000)
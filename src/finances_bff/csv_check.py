@@ -0,0 +1,144 @@
+import asyncio
+import codecs
+import csv
+import io
+import itertools
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+from finances_bff.config import (
+    CSV_ENCODINGS,
+    CSV_MIN_COLUMNS,
+    CSV_SAMPLE_ROWS,
+    CSV_SNIFF_MAX_BYTES,
+)
+from finances_bff.schemas.file import CsvSchema
+
+READ_SIZE = 64 * 1024
+# Delimiters tried, in order of preference when several fit equally well.
+# The file service defaults to ";" (see ProcessDataRequest.delimiter).
+DELIMITERS = (";", ",", "\t", "|")
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+class CsvCheckError(Exception):
+    """
+    Raised when the start of a CSV file shows it cannot be processed.
+    """
+
+
+def read_head(file: BinaryIO, lines: int, max_bytes: int) -> tuple[bytes, bool]:
+    """
+    Read from the start of a file until it has `lines` line breaks or
+    `max_bytes` bytes. Also returns whether the whole file was read.
+    """
+    file.seek(0)
+    data = b""
+    while data.count(b"\n") < lines and len(data) < max_bytes:
+        chunk = file.read(min(READ_SIZE, max_bytes - len(data)))
+        if not chunk:
+            file.seek(0)
+            return data, True
+        data += chunk
+    file.seek(0)
+    return data, False
+
+
+def detect_encoding(data: bytes) -> str:
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            return encoding
+    for encoding in CSV_ENCODINGS:
+        try:
+            # Not final: the head may end in the middle of a character.
+            codecs.getincrementaldecoder(encoding)().decode(data, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise CsvCheckError("Could not detect the encoding of the file")
+
+
+def parse_rows(text: str, delimiter: str, limit: int, complete: bool) -> list[list]:
+    rows = [
+        row
+        for row in itertools.islice(
+            csv.reader(io.StringIO(text), delimiter=delimiter), limit + 1
+        )
+        if row
+    ]
+    if not complete and len(rows) > limit:
+        return rows[:limit]
+    if not complete and len(rows) > 1:
+        # The last row may be cut off.
+        return rows[:-1]
+    return rows[:limit]
+
+
+def detect_delimiter(text: str, limit: int, complete: bool) -> str:
+    """
+    Pick the delimiter that splits every sampled row into the same number
+    of columns, preferring the one giving the most columns.
+    """
+    best, best_columns = None, 0
+    for delimiter in DELIMITERS:
+        counts = {len(row) for row in parse_rows(text, delimiter, limit, complete)}
+        if len(counts) == 1 and (columns := counts.pop()) > max(best_columns, 1):
+            best, best_columns = delimiter, columns
+    if best is not None:
+        return best
+    # No delimiter gives consistent rows; use the one that best splits the
+    # header, so the column count check can point at the broken row.
+    header = text.split("\n", 1)[0]
+    return max(DELIMITERS, key=header.count)
+
+
+def sniff_csv(
+    file: BinaryIO,
+    sample_rows: int = CSV_SAMPLE_ROWS,
+    max_bytes: int = CSV_SNIFF_MAX_BYTES,
+) -> CsvSchema:
+    """
+    Detect the encoding, delimiter and columns of a CSV file from its header
+    and first `sample_rows` rows, and check that the rows fit the header.
+    """
+    data, complete = read_head(file, sample_rows + 1, max_bytes)
+    if not data.strip():
+        raise CsvCheckError("File is empty")
+
+    encoding = detect_encoding(data)
+    text = codecs.getincrementaldecoder(encoding)().decode(data, final=complete)
+
+    delimiter = detect_delimiter(text, sample_rows + 1, complete)
+    header, *rows = parse_rows(text, delimiter, sample_rows + 1, complete)
+    if len(header) < CSV_MIN_COLUMNS:
+        raise CsvCheckError(
+            f"Found {len(header)} column(s) in the header; the delimiter is "
+            f"not one of {', '.join(repr(d) for d in DELIMITERS)}"
+        )
+    for number, row in enumerate(rows, start=2):
+        if len(row) != len(header):
+            raise CsvCheckError(
+                f"Row {number} has {len(row)} columns, the header has {len(header)}"
+            )
+
+    return CsvSchema(
+        encoding=encoding,
+        delimiter=delimiter,
+        columns=header,
+        column_count=len(header),
+        rows=rows,
+    )
+
+
+async def check_csv(
+    upload: UploadFile, sample_rows: int = CSV_SAMPLE_ROWS
+) -> CsvSchema:
+    """
+    Sniff an uploaded CSV file in a worker thread, reading only its head.
+    """
+    return await asyncio.to_thread(sniff_csv, upload.file, sample_rows)
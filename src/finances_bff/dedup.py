@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+
+from fastapi import UploadFile
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _hash_file(upload: UploadFile) -> str:
+    upload.file.seek(0)
+    digest = hashlib.sha256()
+    while chunk := upload.file.read(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    upload.file.seek(0)
+    return digest.hexdigest()
+
+
+async def hash_upload(upload: UploadFile) -> str:
+    """
+    SHA-256 of an uploaded file.
+
+    The upload is already spooled by the time a route runs, so it is read
+    from the spool in a worker thread, where hashlib releases the GIL.
+    """
+    return await asyncio.to_thread(_hash_file, upload)
+
+
+class UploadIndex:
+    """
+    Local SQLite index of the files already sent to the file service.
+
+    Files are keyed by content hash, upload kind and caller, so one caller's
+    upload is never skipped or reported because another caller sent the same
+    content. The index keeps at most
+    `max_entries` files; the ones least recently seen are dropped first.
+    Queries run in a worker thread so the event loop never waits on disk.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            columns = [
+                row[1] for row in self._connection.execute("PRAGMA table_info(uploads)")
+            ]
+            if columns and "caller" not in columns:
+                # An index from before uploads were kept per caller. It only
+                # saves re-sending files, so it is dropped rather than migrated.
+                self._connection.execute("DROP TABLE uploads")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS uploads (
+                    digest TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    caller TEXT NOT NULL,
+                    file_name TEXT,
+                    size INTEGER,
+                    uploaded_at REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    PRIMARY KEY (digest, kind, caller)
+                )
+                """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS uploads_last_seen ON uploads (last_seen)"
+            )
+
+    def _find(self, digest: str, kind: str, caller: str) -> dict | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT file_name, size, uploaded_at FROM uploads"
+                " WHERE digest = ? AND kind = ? AND caller = ?",
+                (digest, kind, caller),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE uploads SET last_seen = ?"
+                " WHERE digest = ? AND kind = ? AND caller = ?",
+                (time.time(), digest, kind, caller),
+            )
+        return {"file_name": row[0], "size": row[1], "uploaded_at": row[2]}
+
+    def _add(
+        self,
+        digest: str,
+        kind: str,
+        caller: str,
+        file_name: str | None,
+        size: int | None,
+    ):
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (digest, kind, caller, file_name, size, now, now),
+            )
+            self._connection.execute(
+                "DELETE FROM uploads WHERE rowid IN ("
+                " SELECT rowid FROM uploads ORDER BY last_seen DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    async def find(self, digest: str, kind: str, caller: str) -> dict | None:
+        """
+        Return the caller's earlier upload of this content, or None.
+        """
+        found = await asyncio.to_thread(self._find, digest, kind, caller)
+        if found is not None:
+            self.hits += 1
+        return found
+
+    async def add(
+        self,
+        digest: str,
+        kind: str,
+        caller: str,
+        file_name: str | None,
+        size: int | None,
+    ) -> None:
+        await asyncio.to_thread(self._add, digest, kind, caller, file_name, size)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
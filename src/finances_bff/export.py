@@ -0,0 +1,69 @@
+import csv
+import io
+from typing import AsyncIterator
+
+import orjson
+
+from finances_bff.logger import logger
+
+CSV_COLUMNS = (
+    "id",
+    "date",
+    "interest_date",
+    "amount",
+    "account_iban",
+    "account_name",
+    "counterparty_iban",
+    "counterparty_name",
+    "description",
+    "tags",
+)
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def encode_ndjson(page: list[dict]) -> bytes:
+    return b"".join(orjson.dumps(statement) + b"\n" for statement in page)
+
+
+def encode_csv(page: list[dict]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [
+            *(statement.get(column) for column in CSV_COLUMNS[:-1]),
+            ";".join(tag["name"] for tag in statement.get("tags") or ()),
+        ]
+        for statement in page
+    )
+    return buffer.getvalue().encode()
+
+
+def csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_COLUMNS)
+    return buffer.getvalue().encode()
+
+
+async def stream_statements(
+    first_page: list[dict], pages: AsyncIterator[list[dict]], export_format: str
+) -> AsyncIterator[bytes]:
+    """
+    Encode statement pages as NDJSON or CSV, one chunk per page.
+
+    The response has already started when a later page fails, so the error
+    is logged and re-raised, which cuts the response off instead of ending it
+    as if the export were complete.
+    """
+    encode = encode_csv if export_format == "csv" else encode_ndjson
+    try:
+        if export_format == "csv":
+            yield csv_header()
+        if first_page:
+            yield encode(first_page)
+        async for page in pages:
+            yield encode(page)
+    except Exception as e:
+        logger.error(f"Statement export failed: {e}")
+        raise
+    finally:
+        await pages.aclose()
@@ -0,0 +1,192 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import orjson
+
+
+class JobFailedError(Exception):
+    """
+    Raised by a job function to fail the job with a status code and detail.
+    """
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class JobLimitError(Exception):
+    """
+    Raised by JobManager.submit when `max_jobs` are kept and none of them is
+    finished, so there is no room for another job.
+    """
+
+
+class Job:
+    """
+    State of a background job, readable while it runs.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.status = self.QUEUED
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.result: Any = None
+        self.error: dict | None = None
+        self.expires_at: float | None = None
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+    def _set_status(self, status: str) -> None:
+        self.status = status
+        now = datetime.now(timezone.utc)
+        if status == self.RUNNING:
+            self.started_at = now
+        elif self.done:
+            self.finished_at = now
+        # Wake everyone waiting for a change, and start a new round.
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_change(self, timeout: float) -> bool:
+        """
+        Wait until the status changes; False if `timeout` passed first.
+        """
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_dict(self) -> dict:
+        def seconds(start: datetime | None, end: datetime | None) -> float | None:
+            if start is None:
+                return None
+            end = end or datetime.now(timezone.utc)
+            return round((end - start).total_seconds(), 3)
+
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queued_seconds": seconds(self.created_at, self.started_at),
+            "running_seconds": seconds(self.started_at, self.finished_at),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Run jobs in the background, at most `max_concurrency` at a time.
+
+    Finished jobs are kept for `ttl` seconds so their result can be fetched,
+    and at most `max_jobs` are kept at all: to make room for a new job the
+    oldest finished ones are dropped first, and if every kept job is still
+    queued or running the new one is refused. Expired jobs are removed when
+    jobs are submitted or read.
+    """
+
+    def __init__(self, max_concurrency: int, ttl: float, max_jobs: int):
+        self.max_concurrency = max_concurrency
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, function: Callable[[], Awaitable[Any]]) -> Job:
+        """
+        Queue `function` to run as a job and return the job at once.
+
+        Raises JobLimitError if `max_jobs` unfinished jobs are already kept.
+        """
+        self._expire()
+        if len(self._jobs) >= self.max_jobs:
+            raise JobLimitError(f"{len(self._jobs)} jobs are already queued or running")
+        job = Job()
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._run(job, function))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        self._expire()
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: Job, function: Callable[[], Awaitable[Any]]) -> None:
+        async with self._slots:
+            job._set_status(Job.RUNNING)
+            try:
+                job.result = await function()
+            except JobFailedError as e:
+                job.error = {"status_code": e.status_code, "detail": e.detail}
+                job._set_status(Job.FAILED)
+            except Exception as e:
+                job.error = {"status_code": 500, "detail": str(e)}
+                job._set_status(Job.FAILED)
+            else:
+                job._set_status(Job.SUCCEEDED)
+            finally:
+                job.expires_at = time.monotonic() + self.ttl
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for job_id, job in list(self._jobs.items()):
+            if job.expires_at is not None and job.expires_at <= now:
+                del self._jobs[job_id]
+
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        while len(self._jobs) >= self.max_jobs and finished:
+            del self._jobs[finished.pop(0)]
+
+    def stats(self) -> dict:
+        statuses = [job.status for job in self._jobs.values()]
+        return {
+            "jobs": len(statuses),
+            "queued": statuses.count(Job.QUEUED),
+            "running": statuses.count(Job.RUNNING),
+            "max_concurrency": self.max_concurrency,
+        }
+
+    async def aclose(self) -> None:
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def job_events(job: Job, keepalive: float) -> AsyncIterator[str]:
+    """
+    Server-sent events with the job's state on every status change, and a
+    comment every `keepalive` seconds in between. Ends once the job is done.
+    """
+    last_status = None
+    # Stop on the status that was sent, not the current one: the job may
+    # finish while an event is being delivered, and its final event must
+    # still be sent.
+    while last_status not in (Job.SUCCEEDED, Job.FAILED):
+        if job.status != last_status:
+            last_status = job.status
+            data = orjson.dumps(job.to_dict()).decode()
+            yield f"event: {last_status}\ndata: {data}\n\n"
+            continue
+        if not await job.wait_for_change(keepalive):
+            yield ": keepalive\n\n"
@@ -1,50 +1,124 @@
-import time
-import os
-import httpx
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
-from finances_bff.logger import logger
+from finances_bff.cache import TTLCache
+from finances_bff.clients import (
+    SERVICES,
+    ServiceClientSettings,
+    create_service_client,
+    create_service_transport,
+)
+from finances_bff.config import (
+    ACCOUNT_CACHE_MAX_SIZE,
+    ACCOUNT_CACHE_TTL,
+    ANALYTICS_CACHE_MAX_SIZE,
+    ANALYTICS_CACHE_TTL,
+    DASHBOARD_CACHE_MAX_SIZE,
+    DASHBOARD_CACHE_TTL,
+    PROCESS_JOB_TTL,
+    PROCESS_MAX_CONCURRENCY,
+    PROCESS_MAX_JOBS,
+    STATEMENT_PREFETCH_MAX_SIZE,
+    STATEMENT_PREFETCH_TTL,
+    TAG_CACHE_MAX_SIZE,
+    TAG_CACHE_TTL,
+    UPLOAD_DEDUP,
+    UPLOAD_DEDUP_MAX_ENTRIES,
+    UPLOAD_DEDUP_PATH,
+)
+from finances_bff.dedup import UploadIndex
+from finances_bff.jobs import JobManager
+from finances_bff.middleware import (
+    CompressionMiddleware,
+    ConditionalGetMiddleware,
+    ErrorHandlingMiddleware,
+    MetricsMiddleware,
+    RequestLoggingMiddleware,
+)
+from finances_bff.paging import PagePrefetcher
+from finances_bff.request_log import request_log_writer
 from finances_bff.routes.account import router as account_router
+from finances_bff.routes.batch import router as batch_router
+from finances_bff.routes.dashboard import router as dashboard_router
 from finances_bff.routes.file import router as file_router
 from finances_bff.routes.health import router as health_router
+from finances_bff.routes.metrics import router as metrics_router
 from finances_bff.routes.statement import router as statement_router
 from finances_bff.routes.tag import router as tag_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    tag_service_url = os.getenv("TAG_SERVICE_URL")
-    if not tag_service_url:
-        raise ValueError("TAG_SERVICE_URL environment variable is not set")
-    app.state.tag_service_client = httpx.AsyncClient(base_url=tag_service_url)
-
-    statement_service_url = os.getenv("STATEMENT_SERVICE_URL")
-    if not statement_service_url:
-        raise ValueError("STATEMENT_SERVICE_URL environment variable is not set")
-    app.state.statement_service_client = httpx.AsyncClient(
-        base_url=statement_service_url
+    # Tests and benchmarks set `app.state.downstream_transports` before
+    # startup to run the BFF against in-process stubs of the services.
+    downstream_transports = getattr(app.state, "downstream_transports", {})
+
+    app.state.service_transports = {}
+    for service in SERVICES:
+        settings = ServiceClientSettings.from_env(service)
+        transport = create_service_transport(
+            service, settings, downstream_transports.get(service)
+        )
+        app.state.service_transports[service] = transport
+        setattr(
+            app.state,
+            f"{service}_service_client",
+            create_service_client(service, settings, transport),
+        )
+
+    app.state.tag_cache = TTLCache(max_size=TAG_CACHE_MAX_SIZE, ttl=TAG_CACHE_TTL)
+    app.state.account_cache = TTLCache(
+        max_size=ACCOUNT_CACHE_MAX_SIZE, ttl=ACCOUNT_CACHE_TTL
+    )
+    app.state.dashboard_cache = TTLCache(
+        max_size=DASHBOARD_CACHE_MAX_SIZE, ttl=DASHBOARD_CACHE_TTL
+    )
+    app.state.analytics_cache = TTLCache(
+        max_size=ANALYTICS_CACHE_MAX_SIZE, ttl=ANALYTICS_CACHE_TTL
+    )
+    app.state.statement_prefetcher = PagePrefetcher(
+        max_size=STATEMENT_PREFETCH_MAX_SIZE, ttl=STATEMENT_PREFETCH_TTL
     )
 
-    account_service_url = os.getenv("ACCOUNT_SERVICE_URL")
-    if not account_service_url:
-        raise ValueError("ACCOUNT_SERVICE_URL environment variable is not set")
-    app.state.account_service_client = httpx.AsyncClient(base_url=account_service_url)
+    app.state.process_jobs = JobManager(
+        max_concurrency=PROCESS_MAX_CONCURRENCY,
+        ttl=PROCESS_JOB_TTL,
+        max_jobs=PROCESS_MAX_JOBS,
+    )
+
+    app.state.upload_index = None
+    if UPLOAD_DEDUP:
+        app.state.upload_index = UploadIndex(
+            UPLOAD_DEDUP_PATH, max_entries=UPLOAD_DEDUP_MAX_ENTRIES
+        )
 
-    file_service_url = os.getenv("FILE_SERVICE_URL")
-    if not file_service_url:
-        raise ValueError("FILE_SERVICE_URL environment variable is not set")
-    app.state.file_service_client = httpx.AsyncClient(base_url=file_service_url)
+    request_log_writer.start()
 
     yield
 
+    await app.state.process_jobs.aclose()
+    await app.state.statement_prefetcher.aclose()
+    if app.state.upload_index is not None:
+        app.state.upload_index.close()
+
+    for service in SERVICES:
+        await getattr(app.state, f"{service}_service_client").aclose()
+
+    request_log_writer.stop()
+
 
 app = FastAPI(
     lifespan=lifespan,
+    # Routes return plain dicts and lists; orjson encodes them, including the
+    # datetimes and UUIDs of the schemas, several times faster than json.
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {"name": "health", "description": "Health check endpoints"},
         {"name": "account", "description": "Account management endpoints"},
+        {"name": "batch", "description": "Several API calls in one request"},
+        {"name": "dashboard", "description": "Data of the dashboard screen"},
         {"name": "file", "description": "File management endpoints"},
         {"name": "statement", "description": "Statement management endpoints"},
         {"name": "tag", "description": "Tag management endpoints"},
@@ -52,49 +126,17 @@ app = FastAPI(
 )
 
 
-@app.middleware("http")
-async def log_response(request: Request, call_next):
-    """
-    Middleware to log request and response details.
-    """
-    start_time = time.perf_counter()
-    data = {
-        "url": str(request.url),
-        "method": request.method,
-        "headers": dict(request.headers),
-    }
-    response = await call_next(request)
-
-    process_time = time.perf_counter() - start_time
-    data["process_time"] = process_time
-    data["response"] = {
-        "status_code": response.status_code,
-        "headers": dict(response.headers),
-    }
-
-    logger.info(data)
-
-    return response
-
-
-@app.middleware("http")
-async def handle_exceptions(request: Request, call_next):
-    """
-    Middleware to handle exceptions and log them.
-    """
-    try:
-        response = await call_next(request)
-        return response
-    except HTTPException as http_exception:
-        logger.error(f"HTTP exception: {http_exception.detail}")
-        return {"error": http_exception.detail}, http_exception.status_code
-    except Exception as e:
-        logger.error(f"Unhandled exception: {e}")
-        return {"error": "Internal Server Error"}, 500
-
+app.add_middleware(ConditionalGetMiddleware)
+app.add_middleware(ErrorHandlingMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(RequestLoggingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(account_router, prefix="/api/v1", tags=["account"])
+app.include_router(batch_router, prefix="/api/v1", tags=["batch"])
+app.include_router(dashboard_router, prefix="/api/v1", tags=["dashboard"])
 app.include_router(file_router, prefix="/api/v1", tags=["file"])
 app.include_router(statement_router, prefix="/api/v1", tags=["statement"])
 app.include_router(tag_router, prefix="/api/v1", tags=["tag"])
 app.include_router(health_router, tags=["health"])
+app.include_router(metrics_router, tags=["health"])
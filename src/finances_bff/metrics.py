@@ -0,0 +1,267 @@
+import bisect
+import time
+from contextvars import ContextVar
+
+import httpx
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# ASGI scope of the request being handled, set by MetricsMiddleware.
+request_scope: ContextVar[dict | None] = ContextVar("request_scope", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float) -> None:
+        self._values[labels] = value
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        # Per label set: a count for each bucket plus +Inf, and the sum.
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, *labels, value: float) -> None:
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        names = self.labels + ("le",)
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, labels + (bound,))} "
+                    f"{cumulative}"
+                )
+            label_text = _format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_text} {total}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    In-process metrics, rendered in the Prometheus text format.
+
+    Updates are plain dict operations on the event loop, so recording a
+    sample costs about as much as a dict lookup.
+    """
+
+    def __init__(self):
+        self.metrics: list[Counter | Gauge | Histogram] = []
+
+    def counter(self, name: str, documentation: str, labels=()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(
+        self, name: str, documentation: str, labels=(), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "bff_http_requests_total",
+    "Requests handled by the BFF.",
+    ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "bff_http_request_duration_seconds",
+    "Time to handle a request, until the last body chunk is sent.",
+    ("method", "route"),
+)
+http_requests_in_flight = registry.gauge(
+    "bff_http_requests_in_flight", "Requests currently being handled."
+)
+http_response_size = registry.histogram(
+    "bff_http_response_size_bytes",
+    "Size of response bodies as sent.",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+downstream_requests = registry.counter(
+    "bff_downstream_requests_total",
+    "Calls made to downstream services, including retries.",
+    ("service", "method", "route", "status"),
+)
+downstream_errors = registry.counter(
+    "bff_downstream_errors_total",
+    "Downstream calls that failed with a transport error or a 5xx response.",
+    ("service", "method", "route", "error"),
+)
+downstream_duration = registry.histogram(
+    "bff_downstream_request_duration_seconds",
+    "Time until the downstream response headers are received.",
+    ("service", "method", "route"),
+)
+downstream_pool_wait = registry.histogram(
+    "bff_downstream_pool_wait_seconds",
+    "Time a downstream call waited for a pooled connection.",
+    ("service",),
+)
+
+
+def route_template(scope: dict) -> str:
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+def calling_route() -> str:
+    """
+    Route template of the request being handled, for example
+    `/api/v1/accounts/{account_id}`.
+
+    Downstream calls are labelled with it rather than with their own path,
+    which carries ids and tag names and would make a series per value.
+    """
+    scope = request_scope.get()
+    return route_template(scope) if scope is not None else "background"
+
+
+class MetricsTransport(httpx.AsyncBaseTransport):
+    """
+    Record latency, status and connection pool wait of each downstream call,
+    labelled with the BFF route that made it.
+
+    The pool wait is the time from sending the request to the transport until
+    the first connection event reported through httpx's trace extension.
+    """
+
+    POOL_EVENTS = (
+        "connection.connect_tcp.started",
+        "connection.connect_unix_socket.started",
+        "http11.send_request_headers.started",
+        "http2.send_request_headers.started",
+    )
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, service: str):
+        self.transport = transport
+        self.service = service
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start_time = time.perf_counter()
+        pool_waited = False
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict) -> None:
+            nonlocal pool_waited
+            if not pool_waited and event_name in self.POOL_EVENTS:
+                pool_waited = True
+                downstream_pool_wait.observe(
+                    self.service, value=time.perf_counter() - start_time
+                )
+            if parent_trace is not None:
+                await parent_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        route = calling_route()
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception as e:
+            downstream_requests.inc(self.service, request.method, route, "error")
+            downstream_errors.inc(self.service, request.method, route, type(e).__name__)
+            raise
+        finally:
+            downstream_duration.observe(
+                self.service,
+                request.method,
+                route,
+                value=time.perf_counter() - start_time,
+            )
+
+        downstream_requests.inc(
+            self.service, request.method, route, str(response.status_code)
+        )
+        if response.status_code >= 500:
+            downstream_errors.inc(
+                self.service, request.method, route, str(response.status_code)
+            )
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,406 @@
+import asyncio
+import time
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from finances_bff import metrics
+from finances_bff.compression import ENCODERS, choose_encoding, is_compressible
+from finances_bff.config import (
+    COMPRESSION_ENCODINGS,
+    COMPRESSION_MIN_SIZE,
+    COMPRESSION_STREAMING,
+    COMPRESSION_THREAD_SIZE,
+)
+from finances_bff.logger import logger
+from finances_bff.proxy import etag_matches, make_etag
+from finances_bff.request_log import (
+    RequestLogWriter,
+    filter_headers,
+    request_log_writer,
+    should_log,
+)
+
+
+class RequestLoggingMiddleware:
+    """
+    Log a sample of requests with the time taken to send the response.
+
+    Which requests are logged and which headers are included is decided by
+    `finances_bff.request_log`. The record is handed to a background writer,
+    so no log I/O happens on the event loop.
+
+    This is a plain ASGI middleware, so the response is passed through as it
+    is sent, streaming responses stay streamed, and background tasks are not
+    counted in the process time.
+    """
+
+    def __init__(self, app: ASGIApp, writer: RequestLogWriter = request_log_writer):
+        self.app = app
+        self.writer = writer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        end_time = None
+        response_start: Message = {}
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal end_time, response_start
+            if message["type"] == "http.response.start":
+                response_start = message
+            elif message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                end_time = time.perf_counter()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            process_time = (end_time or time.perf_counter()) - start_time
+            status_code = response_start.get("status", 500)
+            if should_log(scope["path"], status_code, process_time):
+                self.writer.submit(
+                    {
+                        "url": str(Request(scope).url),
+                        "method": scope["method"],
+                        "headers": filter_headers(scope["headers"]),
+                        "process_time": process_time,
+                        "response": {
+                            "status_code": status_code,
+                            "headers": filter_headers(
+                                response_start.get("headers", [])
+                            ),
+                        },
+                    }
+                )
+
+
+class MetricsMiddleware:
+    """
+    Record request count, latency, response size and in-flight requests.
+
+    Requests are labelled with the route template, for example
+    `/api/v1/accounts/{account_id}`, rather than the raw URL. The scope is
+    kept in `metrics.request_scope` while the request is handled, so the
+    downstream calls it makes are labelled with the same template.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        end_time = None
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal end_time, status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    end_time = time.perf_counter()
+            await send(message)
+
+        metrics.http_requests_in_flight.inc()
+        token = metrics.request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.request_scope.reset(token)
+            metrics.http_requests_in_flight.dec()
+            route_path = metrics.route_template(scope)
+            method = scope["method"]
+            metrics.http_requests.inc(method, route_path, str(status_code))
+            metrics.http_request_duration.observe(
+                method, route_path, value=(end_time or time.perf_counter()) - start_time
+            )
+            metrics.http_response_size.observe(method, route_path, value=response_size)
+
+
+class ConditionalGetMiddleware:
+    """
+    Send an ETag with successful GET responses and answer a matching
+    If-None-Match with 304 Not Modified and no body.
+
+    Routes that already set an ETag, such as pass-through responses built
+    from a cached payload, are not hashed again. Streaming responses are
+    passed through without an ETag. The body headers left out of a 304 are
+    handed to outer middleware under NOT_MODIFIED_BODY_HEADERS, so they can
+    give it the headers they would have given the 200.
+    """
+
+    METHODS = ("GET", "HEAD")
+    # Headers describing the body, which a 304 does not have.
+    BODY_HEADERS = (b"content-length", b"content-type", b"content-encoding")
+    NOT_MODIFIED_BODY_HEADERS = "finances_bff.body_headers"
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in self.METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        response_start: Message | None = None
+        not_modified = False
+
+        async def send_not_modified(etag: str) -> None:
+            headers, body_headers = [], []
+            for key, value in response_start["headers"]:
+                if key.lower() in self.BODY_HEADERS:
+                    body_headers.append((key, value))
+                elif key.lower() != b"etag":
+                    headers.append((key, value))
+            headers.append((b"etag", etag.encode("latin-1")))
+            await send(
+                {
+                    **response_start,
+                    "status": 304,
+                    "headers": headers,
+                    self.NOT_MODIFIED_BODY_HEADERS: body_headers,
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_start, not_modified
+            if not_modified:
+                return
+
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    await send(message)
+                    return
+                etag = Headers(raw=message["headers"]).get("etag")
+                if etag is not None:
+                    if if_none_match and etag_matches(if_none_match, etag):
+                        response_start, not_modified = message, True
+                        await send_not_modified(etag)
+                        return
+                    await send(message)
+                    return
+                # Hold the start until the body can be hashed.
+                response_start = message
+                return
+
+            if response_start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, response_start = response_start, None
+            if message.get("more_body", False):
+                await send(start)
+                await send(message)
+                return
+
+            etag = make_etag(message.get("body", b""))
+            if if_none_match and etag_matches(if_none_match, etag):
+                response_start, not_modified = start, True
+                await send_not_modified(etag)
+                return
+            headers = MutableHeaders(raw=list(start["headers"]))
+            headers["etag"] = etag
+            await send({**start, "headers": headers.raw})
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding the client accepts.
+
+    Complete responses are compressed when they are at least `min_size`
+    bytes. Streamed responses are compressed chunk by chunk, flushing after
+    every chunk so the client still receives data as it is produced, unless
+    `streaming` is off. Large bodies are compressed in a worker thread. A
+    strong ETag is weakened, as the compressed bytes differ from the ones it
+    was computed for. A 304 from ConditionalGetMiddleware gets the same ETag
+    and Vary header as the 200 it stands in for.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: list[str] = COMPRESSION_ENCODINGS,
+        min_size: int = COMPRESSION_MIN_SIZE,
+        streaming: bool = COMPRESSION_STREAMING,
+    ):
+        self.app = app
+        self.encodings = encodings
+        self.min_size = min_size
+        self.streaming = streaming
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        response_start: Message | None = None
+        encoder = None
+        passthrough = False
+
+        async def compress(body: bytes, final: bool) -> bytes:
+            def run() -> bytes:
+                data = encoder.compress(body)
+                return data + (encoder.finish() if final else encoder.flush())
+
+            if len(body) >= COMPRESSION_THREAD_SIZE:
+                return await asyncio.to_thread(run)
+            return run()
+
+        def mark_compressed(headers: MutableHeaders) -> None:
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag is not None and not etag.startswith("W/"):
+                headers["etag"] = f"W/{etag}"
+
+        def compressed_start(content_length: int | None) -> Message:
+            headers = MutableHeaders(raw=list(response_start["headers"]))
+            headers["content-encoding"] = encoding
+            if content_length is None:
+                del headers["content-length"]
+            else:
+                headers["content-length"] = str(content_length)
+            mark_compressed(headers)
+            return {**response_start, "headers": headers.raw}
+
+        def not_modified_start(message: Message) -> Message:
+            # Mark the 304 the way the 200 would have been, judged by the body
+            # headers ConditionalGetMiddleware left out of it.
+            message = dict(message)
+            body_headers = Headers(
+                raw=message.pop(ConditionalGetMiddleware.NOT_MODIFIED_BODY_HEADERS, [])
+            )
+            content_length = body_headers.get("content-length")
+            if (
+                "content-encoding" not in body_headers
+                and is_compressible(body_headers.get("content-type"))
+                and (
+                    int(content_length) >= self.min_size
+                    if content_length is not None
+                    else self.streaming
+                )
+            ):
+                headers = MutableHeaders(raw=list(message["headers"]))
+                mark_compressed(headers)
+                message["headers"] = headers.raw
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_start, encoder, passthrough
+
+            if message["type"] == "http.response.start":
+                if message["status"] == 304:
+                    passthrough = True
+                    await send(not_modified_start(message))
+                    return
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] == 204
+                    or "content-encoding" in headers
+                    or not is_compressible(headers.get("content-type"))
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                response_start = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                if not more_body:
+                    if len(body) < self.min_size:
+                        passthrough = True
+                        await send(response_start)
+                        await send(message)
+                        return
+                    encoder = ENCODERS[encoding]()
+                    body = await compress(body, final=True)
+                    await send(compressed_start(len(body)))
+                    await send({**message, "body": body})
+                    return
+                if not self.streaming:
+                    passthrough = True
+                    await send(response_start)
+                    await send(message)
+                    return
+                encoder = ENCODERS[encoding]()
+                await send(compressed_start(None))
+
+            body = await compress(body, final=not more_body)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class ErrorHandlingMiddleware:
+    """
+    Turn exceptions that escape the routes into JSON error responses.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except HTTPException as http_exception:
+            logger.error(f"HTTP exception: {http_exception.detail}")
+            if response_started:
+                raise
+            response = ORJSONResponse(
+                {"error": http_exception.detail},
+                status_code=http_exception.status_code,
+            )
+            await response(scope, receive, send)
+        except Exception as e:
+            logger.error(f"Unhandled exception: {e}")
+            if response_started:
+                raise
+            response = ORJSONResponse(
+                {"error": "Internal Server Error"}, status_code=500
+            )
+            await response(scope, receive, send)
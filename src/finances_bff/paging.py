@@ -0,0 +1,208 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, NamedTuple
+
+import httpx
+import orjson
+
+from finances_bff.cache import TTLCache
+
+# Shifts a cursor's date just past it, so the statement service returns the
+# cursor's own date whether its date filters are inclusive or not.
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+async def fetch_statement_page(
+    statement_service_client: httpx.AsyncClient, params: dict, skip: int, limit: int
+) -> list[dict]:
+    """
+    Get one page of the statements matching the filters.
+    """
+    response = await statement_service_client.get(
+        "/api/v1/statements/", params={**params, "skip": skip, "limit": limit}
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+async def iter_statement_pages(
+    statement_service_client: httpx.AsyncClient, params: dict, page_size: int
+) -> AsyncIterator[list[dict]]:
+    """
+    Page through all statements matching the filters.
+
+    The next page is requested as soon as a page arrives, so it downloads
+    while the caller processes the current one. At most two pages are held at
+    a time. The first page is always yielded, even when it is empty.
+    """
+    skip = 0
+    next_page: asyncio.Task | None = asyncio.create_task(
+        fetch_statement_page(statement_service_client, params, skip, page_size)
+    )
+    try:
+        while next_page is not None:
+            page = await next_page
+            next_page = None
+            if len(page) >= page_size:
+                skip += page_size
+                next_page = asyncio.create_task(
+                    fetch_statement_page(
+                        statement_service_client, params, skip, page_size
+                    )
+                )
+            if page or skip == 0:
+                yield page
+    finally:
+        # The caller stopped early; drop the prefetched page.
+        if next_page is not None:
+            next_page.cancel()
+            await asyncio.gather(next_page, return_exceptions=True)
+
+
+class StatementCursor(NamedTuple):
+    """
+    Position after the last statement of a page, in (date, id) order.
+    """
+
+    date: str
+    id: str
+    # Digest of the filters of the listing the cursor belongs to.
+    filters: str
+
+    def encode(self) -> str:
+        data = orjson.dumps({"d": self.date, "i": self.id, "f": self.filters})
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "StatementCursor":
+        """
+        Parse an opaque cursor; ValueError if it is malformed.
+        """
+        try:
+            data = orjson.loads(
+                base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            )
+            date = str(data["d"])
+            # The date is passed on as before_date, so it must parse.
+            datetime.fromisoformat(date) + ONE_MICROSECOND
+            return cls(date, str(data["i"]), str(data["f"]))
+        except (binascii.Error, ValueError, KeyError, TypeError, OverflowError) as e:
+            raise ValueError("Invalid cursor") from e
+
+
+def filters_digest(filters: dict) -> str:
+    return hashlib.blake2b(
+        orjson.dumps(filters, option=orjson.OPT_SORT_KEYS), digest_size=8
+    ).hexdigest()
+
+
+def statement_position(statement: dict) -> tuple[str, str]:
+    return statement["date"], statement["id"]
+
+
+async def fetch_cursor_page(
+    statement_service_client: httpx.AsyncClient,
+    filters: dict,
+    limit: int,
+    cursor: StatementCursor | None,
+    overfetch: int,
+) -> tuple[list[dict], str | None]:
+    """
+    Get the page of statements after the cursor and the cursor of the page
+    after it, or None on the last page.
+
+    Pages are ordered by (date, id), newest first. The statement service is
+    asked for the statements up to the cursor's date, which it returns
+    newest first, `limit + overfetch` rows at a time. Reading stops once a
+    row older than the last date on the page has been seen, so every
+    statement of that date is known before the page is cut; rows sharing a
+    date cannot be skipped or repeated, whatever order the service gives them.
+    """
+    params = dict(filters)
+    position = None
+    if cursor is not None:
+        position = (cursor.date, cursor.id)
+        params["before_date"] = (
+            datetime.fromisoformat(cursor.date) + ONE_MICROSECOND
+        ).isoformat()
+
+    batch_size = limit + overfetch + 1
+    rows: list[dict] = []
+    oldest_date = None
+    skip = 0
+    while True:
+        batch = await fetch_statement_page(
+            statement_service_client, params, skip, batch_size
+        )
+        rows.extend(
+            statement
+            for statement in batch
+            if position is None or statement_position(statement) < position
+        )
+        if batch:
+            batch_oldest = min(statement["date"] for statement in batch)
+            oldest_date = min(oldest_date or batch_oldest, batch_oldest)
+        if len(batch) < batch_size:
+            break
+        if len(rows) > limit:
+            rows.sort(key=statement_position, reverse=True)
+            if oldest_date < rows[limit - 1]["date"]:
+                break
+        skip += batch_size
+
+    rows.sort(key=statement_position, reverse=True)
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = StatementCursor(
+            last["date"], last["id"], filters_digest(filters)
+        ).encode()
+    return page, next_cursor
+
+
+class PagePrefetcher:
+    """
+    Pages fetched ahead of the client, kept for a short time.
+
+    A prefetch runs as a background task that is stored in the cache right
+    away, so a client asking for the page while it is still loading waits for
+    that task instead of starting another fetch.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.cache = TTLCache(max_size=max_size, ttl=ttl)
+        self._tasks: set[asyncio.Task] = set()
+
+    def prefetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if self.cache.get(key) is not None:
+            return
+        task = asyncio.create_task(fetch())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self.cache.set(key, task)
+
+    async def get(self, key: Hashable) -> Any | None:
+        """
+        Return the prefetched page, or None if it is missing or failed.
+        """
+        task = self.cache.get(key)
+        if task is None:
+            return None
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            self.cache.delete(key)
+            return None
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    async def aclose(self) -> None:
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
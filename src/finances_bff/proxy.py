@@ -0,0 +1,96 @@
+import hashlib
+from typing import Any, NamedTuple
+
+import httpx
+import orjson
+from fastapi import Response
+
+from finances_bff.config import PASSTHROUGH_ROUTES, VALIDATE_RESPONSES
+
+
+def make_etag(content: bytes) -> str:
+    """
+    Strong entity tag of a response body.
+    """
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an entity tag, using the weak
+    comparison RFC 9110 prescribes for it.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+class Payload(NamedTuple):
+    """
+    A downstream response body, kept as the bytes it was received as, with
+    its entity tag.
+    """
+
+    content: bytes
+    media_type: str = "application/json"
+    etag: str | None = None
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "Payload":
+        # A strong ETag from the service identifies these exact bytes, so
+        # it can be reused instead of hashing the body.
+        etag = response.headers.get("etag")
+        if etag is None or etag.startswith("W/"):
+            etag = make_etag(response.content)
+        return cls(
+            response.content,
+            response.headers.get("content-type", "application/json"),
+            etag,
+        )
+
+    @classmethod
+    def from_data(cls, data: Any) -> "Payload":
+        content = orjson.dumps(data)
+        return cls(content, etag=make_etag(content))
+
+    def json(self) -> Any:
+        return orjson.loads(self.content)
+
+
+def passthrough_enabled(route_name: str) -> bool:
+    """
+    Check whether the route forwards downstream bodies without validating them.
+    """
+    if VALIDATE_RESPONSES:
+        return False
+    return "*" in PASSTHROUGH_ROUTES or route_name in PASSTHROUGH_ROUTES
+
+
+def respond(payload: Payload, route_name: str, status_code: int = 200) -> Any:
+    """
+    Build the route's return value from a downstream body.
+
+    In pass-through mode the body is sent unchanged, which skips parsing,
+    response model validation and serialization, and the payload's ETag is
+    sent with it. Otherwise the parsed JSON is returned and FastAPI
+    validates it against the response model.
+    """
+    if passthrough_enabled(route_name):
+        return Response(
+            content=payload.content,
+            status_code=status_code,
+            media_type=payload.media_type,
+            headers={"ETag": payload.etag} if payload.etag else None,
+        )
+    return payload.json()
+
+
+def forward_response(response: httpx.Response, route_name: str) -> Any:
+    """
+    Build the route's return value from a successful downstream response.
+    """
+    return respond(Payload.from_response(response), route_name, response.status_code)
@@ -0,0 +1,96 @@
+import queue
+import random
+import threading
+from logging import Logger
+
+from finances_bff.config import (
+    REQUEST_LOG_EXCLUDE_PATHS,
+    REQUEST_LOG_HEADERS,
+    REQUEST_LOG_QUEUE_SIZE,
+    REQUEST_LOG_SAMPLE_RATE,
+    REQUEST_LOG_SLOW_SECONDS,
+)
+from finances_bff.logger import logger
+
+REDACTED_HEADERS = {"authorization", "proxy-authorization", "cookie", "set-cookie"}
+
+_allowed_headers = {name.lower() for name in REQUEST_LOG_HEADERS}
+_excluded_paths = set(REQUEST_LOG_EXCLUDE_PATHS)
+_stop = object()
+
+
+def should_log(path: str, status_code: int, process_time: float) -> bool:
+    """
+    Decide whether a request is logged: never for excluded paths, always for
+    errors and slow requests, and a sample of everything else.
+    """
+    if path in _excluded_paths:
+        return False
+    if status_code >= 400 or process_time >= REQUEST_LOG_SLOW_SECONDS:
+        return True
+    return random.random() < REQUEST_LOG_SAMPLE_RATE
+
+
+def filter_headers(raw_headers: list[tuple[bytes, bytes]]) -> dict[str, str]:
+    """
+    Keep the allowlisted headers and redact the ones carrying credentials.
+    """
+    headers = {}
+    for raw_name, raw_value in raw_headers:
+        name = raw_name.decode("latin-1").lower()
+        if name not in _allowed_headers:
+            continue
+        if name in REDACTED_HEADERS:
+            headers[name] = "[REDACTED]"
+        else:
+            headers[name] = raw_value.decode("latin-1")
+    return headers
+
+
+class RequestLogWriter:
+    """
+    Write request log records from a background thread.
+
+    The event loop only puts records on a bounded queue, so it never waits
+    for log I/O. Records are dropped and counted when the queue is full.
+    """
+
+    def __init__(self, logger: Logger, max_size: int = REQUEST_LOG_QUEUE_SIZE):
+        self.logger = logger
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="request-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Write the queued records and stop the thread.
+        """
+        if self._thread is None:
+            return
+        self._queue.put(_stop)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, record: dict) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is _stop:
+                return
+            self.logger.info(record)
+
+
+request_log_writer = RequestLogWriter(logger)
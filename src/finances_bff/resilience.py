@@ -0,0 +1,254 @@
+import asyncio
+import random
+import time
+from typing import AsyncIterator, Callable
+
+import httpx
+
+RETRY_METHODS = ("GET", "HEAD")
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+class ServiceRejectedError(httpx.TransportError):
+    """
+    Raised when a request is refused without calling the service.
+
+    It is an httpx.RequestError, so the routes answer it with a 503 like any
+    other unreachable service.
+    """
+
+
+class CircuitOpenError(ServiceRejectedError):
+    pass
+
+
+class BulkheadFullError(ServiceRejectedError):
+    pass
+
+
+class ClosingStream(httpx.AsyncByteStream):
+    """
+    Response body stream that calls `on_close` once when it is closed, with
+    the exception raised while reading it, or None.
+    """
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        on_close: Callable[[BaseException | None], None],
+    ):
+        self._stream = stream
+        self._on_close = on_close
+        self._error: BaseException | None = None
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except BaseException as e:
+            self._error = e
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close(self._error)
+                self._on_close = None
+
+
+class CircuitBreaker:
+    """
+    Stop calling a service after repeated failures.
+
+    The breaker opens after `failure_threshold` consecutive failures. While
+    open every call is rejected. After `reset_timeout` seconds it lets a
+    single trial call through: success closes it, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.times_opened = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def release(self) -> None:
+        """
+        End a call that says nothing about the service's health.
+        """
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            if self._opened_at is None:
+                self.times_opened += 1
+            self._opened_at = time.monotonic()
+        self._trial_running = False
+
+
+class ResilienceTransport(httpx.AsyncBaseTransport):
+    """
+    Circuit breaker, GET retries and a concurrency bulkhead for one service.
+
+    Connection errors, timeouts and 5xx responses count as failures. GET and
+    HEAD requests are retried up to `retry_attempts` times on transport
+    errors and 502/503/504 responses, waiting a random time of up to
+    `retry_backoff * 2 ** attempt` seconds (capped at `retry_backoff_max`)
+    between attempts. At most `max_concurrency` requests run at once; others
+    wait up to `bulkhead_timeout` seconds for a slot and are then rejected.
+
+    A request holds its slot, and a successful response is only counted,
+    until the response body is closed, so a body that fails to arrive, for
+    example with a read timeout, counts as a failure.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        retry_attempts: int = 2,
+        retry_backoff: float = 0.1,
+        retry_backoff_max: float = 2.0,
+        max_concurrency: int = 100,
+        bulkhead_timeout: float = 1.0,
+    ):
+        self.transport = transport
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.retry_attempts = retry_attempts
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.max_concurrency = max_concurrency
+        self.bulkhead_timeout = bulkhead_timeout
+        self.active = 0
+        self.retries = 0
+        self.rejected_open = 0
+        self.rejected_bulkhead = 0
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.bulkhead_timeout)
+        except asyncio.TimeoutError:
+            self.rejected_bulkhead += 1
+            raise BulkheadFullError(
+                f"Too many concurrent requests to {request.url.host}",
+                request=request,
+            )
+
+        self.active += 1
+        try:
+            response = await self._send_with_retries(request)
+        except BaseException:
+            self._release_slot()
+            raise
+
+        def finish(error: BaseException | None) -> None:
+            self._release_slot()
+            # 5xx responses were already counted as failures.
+            if response.status_code >= 500:
+                return
+            if error is None:
+                self.breaker.record_success()
+            elif isinstance(error, httpx.TransportError):
+                self.breaker.record_failure()
+            else:
+                self.breaker.release()
+
+        if response.is_closed:
+            finish(None)
+        else:
+            response.stream = ClosingStream(response.stream, finish)
+        return response
+
+    def _release_slot(self) -> None:
+        self.active -= 1
+        self._slots.release()
+
+    async def _send_with_retries(self, request: httpx.Request) -> httpx.Response:
+        attempts = 1
+        if request.method in RETRY_METHODS:
+            attempts += self.retry_attempts
+
+        for attempt in range(attempts):
+            if attempt > 0:
+                self.retries += 1
+                backoff = min(self.retry_backoff_max, self.retry_backoff * 2**attempt)
+                await asyncio.sleep(random.uniform(0, backoff))
+
+            last_attempt = attempt == attempts - 1
+            if not self.breaker.allow():
+                self.rejected_open += 1
+                raise CircuitOpenError(
+                    f"Circuit breaker is open for {request.url.host}",
+                    request=request,
+                )
+
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.PoolTimeout:
+                # The pool is saturated by the BFF's own requests, which says
+                # nothing about the service, and a retry would queue again.
+                self.breaker.release()
+                raise
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                if last_attempt:
+                    raise
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+
+            if response.status_code < 500:
+                return response
+
+            self.breaker.record_failure()
+            if last_attempt or response.status_code not in RETRY_STATUS_CODES:
+                return response
+            await response.aclose()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "breaker_state": self.breaker.state,
+            "breaker_failures": self.breaker.failures,
+            "breaker_opened": self.breaker.times_opened,
+            "active": self.active,
+            "max_concurrency": self.max_concurrency,
+            "retries": self.retries,
+            "rejected_open": self.rejected_open,
+            "rejected_bulkhead": self.rejected_bulkhead,
+        }
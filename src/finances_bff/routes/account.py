@@ -1,30 +1,70 @@
 import httpx
 from fastapi import APIRouter, HTTPException, Depends
 
-from finances_bff.utils import get_account_service_client
+from finances_bff.cache import TTLCache
+from finances_bff.proxy import Payload, respond
+from finances_bff.utils import get_account_cache, get_account_service_client
 from finances_bff.schemas import account as account_schemas
 
 router = APIRouter()
 
+ACCOUNT_LIST_KEY = "accounts"
+
+
+def account_groups(account: dict) -> set[str]:
+    """
+    Ids whose change makes a cached account stale: its own, its parent's and
+    those of its aliases.
+    """
+    groups = {str(account["id"])}
+    if account.get("parent_id"):
+        groups.add(str(account["parent_id"]))
+    for alias in account.get("aliases", []):
+        groups.add(str(alias["id"]))
+    return groups
+
+
+async def fetch_accounts(
+    account_service_client: httpx.AsyncClient,
+    account_cache: TTLCache,
+    params_dict: dict,
+) -> Payload:
+    """
+    Get the accounts matching the filters, from the cache when possible.
+    """
+    cache_key = (ACCOUNT_LIST_KEY, tuple(sorted(params_dict.items())))
+    cached = account_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    response = await account_service_client.get("/api/v1/accounts/", params=params_dict)
+    response.raise_for_status()
+    payload = Payload.from_response(response)
+    groups = {ACCOUNT_LIST_KEY}
+    for account in payload.json():
+        groups |= account_groups(account)
+    account_cache.set(cache_key, payload, groups=groups)
+    return payload
+
 
 @router.get("/accounts/", response_model=list[account_schemas.AccountOut])
 async def read_accounts(
     params: account_schemas.AccountsFilter = Depends(),
     account_service_client: httpx.AsyncClient = Depends(get_account_service_client),
+    account_cache: TTLCache = Depends(get_account_cache),
 ):
     """
     Get all accounts.
     """
-    try:
-        params_dict = params.model_dump(exclude_unset=True)
+    params_dict = params.model_dump(exclude_unset=True)
 
-        params_dict = {k: v for k, v in params_dict.items() if v is not None}
+    params_dict = {k: v for k, v in params_dict.items() if v is not None}
 
-        response = await account_service_client.get(
-            "/api/v1/accounts/", params=params_dict
+    try:
+        payload = await fetch_accounts(
+            account_service_client, account_cache, params_dict
         )
-        response.raise_for_status()
-        return response.json()
+        return respond(payload, "read_accounts")
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=503, detail=f"Account service is unavailable: {str(e)}"
@@ -37,6 +77,7 @@ async def read_accounts(
 async def create_account(
     account: account_schemas.AccountCreate,
     account_service_client: httpx.AsyncClient = Depends(get_account_service_client),
+    account_cache: TTLCache = Depends(get_account_cache),
 ):
     """
     Create a new account.
@@ -47,6 +88,9 @@ async def create_account(
             json=account.model_dump(mode="json", exclude_unset=True),
         )
         response.raise_for_status()
+        account_cache.invalidate(ACCOUNT_LIST_KEY)
+        if account.parent_id:
+            account_cache.invalidate(str(account.parent_id))
         return response.json()
     except httpx.RequestError as e:
         raise HTTPException(
@@ -60,14 +104,25 @@ async def create_account(
 async def read_account(
     account_id: str,
     account_service_client: httpx.AsyncClient = Depends(get_account_service_client),
+    account_cache: TTLCache = Depends(get_account_cache),
 ):
     """
     Get a specific account by ID.
     """
+    cached = account_cache.get(("account", account_id))
+    if cached is not None:
+        return respond(cached, "read_account")
+
     try:
         response = await account_service_client.get(f"/api/v1/accounts/{account_id}")
         response.raise_for_status()
-        return response.json()
+        payload = Payload.from_response(response)
+        account_cache.set(
+            ("account", account_id),
+            payload,
+            groups=account_groups(payload.json()) | {account_id},
+        )
+        return respond(payload, "read_account")
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=503, detail=f"Account service is unavailable: {str(e)}"
@@ -80,6 +135,7 @@ async def read_account(
 async def create_alias(
     body: account_schemas.AccountAlias,
     account_service_client: httpx.AsyncClient = Depends(get_account_service_client),
+    account_cache: TTLCache = Depends(get_account_cache),
 ):
     """
     Add an alias to the account.
@@ -97,6 +153,8 @@ async def create_alias(
         )
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
+    finally:
+        account_cache.invalidate(str(body.account_id), str(body.alias_id))
 
 
 @router.put("/accounts/{account_id}", response_model=account_schemas.AccountOut)
@@ -104,6 +162,7 @@ async def update_account(
     account: account_schemas.AccountUpdate,
     account_id: str,
     account_service_client: httpx.AsyncClient = Depends(get_account_service_client),
+    account_cache: TTLCache = Depends(get_account_cache),
 ):
     """
     Update a specific account by ID.
@@ -121,12 +180,19 @@ async def update_account(
         )
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
+    finally:
+        # The new values may match filters the account did not match before,
+        # so every cached list is dropped, not only those containing it.
+        account_cache.invalidate(ACCOUNT_LIST_KEY, account_id)
+        if account.parent_id:
+            account_cache.invalidate(str(account.parent_id))
 
 
 @router.delete("/accounts/{account_id}")
 async def delete_account(
     account_id: str,
     account_service_client: httpx.AsyncClient = Depends(get_account_service_client),
+    account_cache: TTLCache = Depends(get_account_cache),
 ):
     """
     Delete a specific account by ID.
@@ -141,3 +207,5 @@ async def delete_account(
         )
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
+    finally:
+        account_cache.invalidate(account_id)
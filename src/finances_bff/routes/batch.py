@@ -0,0 +1,120 @@
+import asyncio
+
+import httpx
+import orjson
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Response
+from starlette.routing import Match
+
+from finances_bff.config import (
+    BATCH_MAX_CONCURRENCY,
+    BATCH_MAX_REQUESTS,
+    BATCH_REQUEST_TIMEOUT,
+    BATCH_ROUTES,
+)
+from finances_bff.schemas import batch as batch_schemas
+
+router = APIRouter()
+
+# Headers of the batch request passed on to every sub-request.
+FORWARDED_HEADERS = ("authorization", "cookie", "x-request-id")
+
+
+def route_name(app: FastAPI, method: str, path: str) -> str | None:
+    """
+    Name of the route that would handle a request, or None if there is none.
+    """
+    scope = {"type": "http", "method": method, "path": path}
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.name
+    return None
+
+
+def encode_result(
+    sub_request: batch_schemas.BatchSubRequest, response: httpx.Response
+) -> bytes:
+    """
+    Encode a sub-request's result, embedding a JSON body as it is instead of
+    parsing and serializing it again.
+    """
+    result = orjson.dumps({"id": sub_request.id, "status": response.status_code})
+    content_type = response.headers.get("content-type", "")
+    if response.content and content_type.startswith("application/json"):
+        body = response.content
+    else:
+        body = orjson.dumps(response.text or None)
+    return result[:-1] + b',"body":' + body + b"}"
+
+
+@router.post("/batch")
+async def batch(body: batch_schemas.BatchRequest, request: Request):
+    """
+    Run several API calls in one round-trip.
+
+    Each sub-request is dispatched through the app itself, so it passes the
+    same middleware, caches and downstream clients as a direct call. Only
+    the JSON routes listed in BATCH_ROUTES can be called. At most
+    BATCH_MAX_CONCURRENCY run at a time, each is answered with 504 if it
+    takes longer than BATCH_REQUEST_TIMEOUT, and the results are returned in
+    the order of the sub-requests, each with its own status.
+    """
+    if len(body.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BATCH_MAX_REQUESTS} requests can be batched",
+        )
+    for sub_request in body.requests:
+        name = route_name(request.app, sub_request.method, sub_request.path)
+        if name not in BATCH_ROUTES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot batch {sub_request.method} {sub_request.path}",
+            )
+
+    headers = {
+        name: request.headers[name]
+        for name in FORWARDED_HEADERS
+        if name in request.headers
+    }
+    # The batch response is compressed as a whole, not each sub-response.
+    headers["accept-encoding"] = "identity"
+    slots = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    # httpx timeouts do not apply to an ASGI transport, the app runs in the
+    # calling task; the deadline is enforced by cancelling that task instead.
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=request.app, raise_app_exceptions=False),
+        base_url=str(request.base_url),
+        headers=headers,
+        timeout=None,
+    ) as client:
+
+        async def run(sub_request: batch_schemas.BatchSubRequest) -> bytes:
+            async with slots:
+                try:
+                    response = await asyncio.wait_for(
+                        client.request(
+                            sub_request.method,
+                            sub_request.path,
+                            params=sub_request.params,
+                            json=sub_request.body,
+                        ),
+                        BATCH_REQUEST_TIMEOUT,
+                    )
+                except asyncio.TimeoutError:
+                    response = httpx.Response(
+                        504,
+                        json={
+                            "detail": "Request did not finish within "
+                            f"{BATCH_REQUEST_TIMEOUT}s"
+                        },
+                    )
+            return encode_result(sub_request, response)
+
+        results = await asyncio.gather(*(run(sub) for sub in body.requests))
+
+    return Response(
+        content=b'{"results":[' + b",".join(results) + b"]}",
+        media_type="application/json",
+    )
@@ -0,0 +1,152 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable
+
+import httpx
+import orjson
+from fastapi import APIRouter, Depends, Request
+
+import finances_bff.utils as utils
+from finances_bff.cache import TTLCache
+from finances_bff.config import (
+    DASHBOARD_SECTION_TIMEOUTS,
+    DASHBOARD_SUMMARY_DAYS,
+    DASHBOARD_SUMMARY_LIMIT,
+)
+from finances_bff.proxy import Payload, respond
+from finances_bff.routes.account import fetch_accounts
+from finances_bff.routes.tag import fetch_tags
+from finances_bff.schemas import dashboard as dashboard_schemas
+
+router = APIRouter()
+
+SECTION_SERVICES = {
+    "accounts": "Account",
+    "tags": "Tag",
+    "recent_statements": "Statement",
+    "summary": "Statement",
+}
+
+
+async def load_section(name: str, section: Awaitable[Any]) -> tuple[Any, str | None]:
+    """
+    Run a dashboard section within its deadline, returning its data or the
+    reason it could not be loaded.
+    """
+    label = SECTION_SERVICES[name]
+    timeout = DASHBOARD_SECTION_TIMEOUTS[name]
+    try:
+        return await asyncio.wait_for(section, timeout), None
+    except asyncio.TimeoutError:
+        return None, f"{label} service did not respond within {timeout}s"
+    except httpx.RequestError as e:
+        return None, f"{label} service is unavailable: {str(e)}"
+    except httpx.HTTPStatusError as e:
+        return None, str(e)
+    except (ValueError, TypeError, KeyError) as e:
+        return None, f"{label} service sent an invalid response: {str(e)}"
+
+
+async def fetch_statements(
+    statement_service_client: httpx.AsyncClient, params: dict
+) -> list[dict]:
+    response = await statement_service_client.get("/api/v1/statements/", params=params)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+async def fetch_summary(
+    statement_service_client: httpx.AsyncClient, filters: dict
+) -> dict:
+    """
+    Sum the amounts of the statements in the filtered period.
+    """
+    after_date = (
+        filters.get("after_date")
+        or (
+            datetime.now(timezone.utc) - timedelta(days=DASHBOARD_SUMMARY_DAYS)
+        ).isoformat()
+    )
+    statements = await fetch_statements(
+        statement_service_client,
+        {**filters, "after_date": after_date, "limit": DASHBOARD_SUMMARY_LIMIT},
+    )
+
+    income = expenses = 0
+    for statement in statements:
+        amount = statement["amount"]
+        if amount > 0:
+            income += amount
+        else:
+            expenses += amount
+
+    return {
+        "after_date": after_date,
+        "before_date": filters.get("before_date"),
+        "count": len(statements),
+        "income": income,
+        "expenses": expenses,
+        "net": income + expenses,
+        "truncated": len(statements) >= DASHBOARD_SUMMARY_LIMIT,
+    }
+
+
+@router.get("/dashboard", response_model=dashboard_schemas.DashboardOut)
+async def read_dashboard(
+    request: Request,
+    params: dashboard_schemas.DashboardFilters = Depends(),
+    account_service_client: httpx.AsyncClient = Depends(
+        utils.get_account_service_client
+    ),
+    statement_service_client: httpx.AsyncClient = Depends(
+        utils.get_statement_service_client
+    ),
+    tag_service_client: httpx.AsyncClient = Depends(utils.get_tag_service_client),
+    account_cache: TTLCache = Depends(utils.get_account_cache),
+    tag_cache: TTLCache = Depends(utils.get_tag_cache),
+    dashboard_cache: TTLCache = Depends(utils.get_dashboard_cache),
+):
+    """
+    Get everything the dashboard screen shows in one call.
+
+    Accounts, tags, recent statements and the summary of the period are
+    loaded concurrently, each within its own deadline. A section that fails
+    is null and its error is listed under `errors`; complete dashboards are
+    cached for DASHBOARD_CACHE_TTL seconds per caller and filter set.
+    """
+    params_dict = params.model_dump(mode="json", exclude_none=True)
+    cache_key = (
+        "dashboard",
+        utils.caller_key(request),
+        tuple(sorted(params_dict.items())),
+    )
+    cached = dashboard_cache.get(cache_key)
+    if cached is not None:
+        return respond(cached, "read_dashboard")
+
+    limit = params_dict.pop("limit")
+    sections = {
+        "accounts": fetch_accounts(account_service_client, account_cache, {}),
+        "tags": fetch_tags(tag_service_client, tag_cache),
+        "recent_statements": fetch_statements(
+            statement_service_client, {**params_dict, "limit": limit}
+        ),
+        "summary": fetch_summary(statement_service_client, params_dict),
+    }
+    results = await asyncio.gather(
+        *(load_section(name, section) for name, section in sections.items())
+    )
+
+    dashboard = {"errors": {}}
+    for name, (data, error) in zip(sections, results):
+        if isinstance(data, Payload):
+            data = data.json()
+        dashboard[name] = data
+        if error is not None:
+            dashboard["errors"][name] = error
+
+    payload = Payload.from_data(dashboard)
+    # A degraded dashboard is not kept, so the next request tries again.
+    if not dashboard["errors"]:
+        dashboard_cache.set(cache_key, payload)
+    return respond(payload, "read_dashboard")
@@ -1,93 +1,372 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from functools import partial
+from typing import Literal, NamedTuple
+
 import httpx
-from fastapi import APIRouter, HTTPException, Depends, UploadFile
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, UploadFile
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from finances_bff.utils import get_file_service_client
+from finances_bff.cache import TTLCache
+from finances_bff.config import (
+    CSV_PRECHECK,
+    CSV_PREVIEW_MAX_ROWS,
+    PROCESS_EVENTS_KEEPALIVE,
+    UPLOAD_BULK_CONCURRENCY,
+    UPLOAD_BULK_MAX_FILES,
+)
+from finances_bff.csv_check import CsvCheckError, check_csv
+from finances_bff.dedup import UploadIndex, hash_upload
+from finances_bff.jobs import JobFailedError, JobLimitError, JobManager, job_events
+from finances_bff.paging import PagePrefetcher
+from finances_bff.proxy import forward_response
 from finances_bff.schemas import file as file_schemas
+from finances_bff.upload import UploadTooLargeError, forward_upload
+from finances_bff.utils import (
+    caller_key,
+    get_analytics_cache,
+    get_file_service_client,
+    get_process_jobs,
+    get_statement_prefetcher,
+    get_upload_index,
+)
 
 router = APIRouter()
 
 
-@router.post("/upload/zip", tags=["file"])
-async def upload_zip(
-    zip_file: UploadFile,
-    file_service_client: httpx.AsyncClient = Depends(get_file_service_client),
-):
+class UploadKind(NamedTuple):
+    label: str
+    field_name: str
+    content_type: str
+    extension: str
+    url: str
+
+
+UPLOAD_KINDS = {
+    "zip": UploadKind(
+        "zip", "zip_file", "application/zip", ".zip", "/api/v1/upload/zip"
+    ),
+    "csv": UploadKind("CSV", "csv_file", "text/csv", ".csv", "/api/v1/upload/csv"),
+}
+
+
+def validate_upload(upload: UploadFile, kind: UploadKind) -> None:
     """
-    Endpoint to upload zip data.
+    Check the content type and file name of an upload.
     """
-    if not zip_file or zip_file.content_type != "application/zip":
+    if not upload or upload.content_type != kind.content_type:
         raise HTTPException(
-            status_code=400, detail="Invalid file type. Only zip files are allowed."
+            status_code=400,
+            detail=f"Invalid file type. Only {kind.label} files are allowed.",
         )
 
-    file_name = zip_file.filename
+    if not (upload.filename or "").endswith(kind.extension):
+        raise HTTPException(status_code=400, detail=f"File is not a {kind.label} file")
 
-    if not file_name.endswith(".zip"):
-        raise HTTPException(status_code=400, detail="File is not a zip file")
 
-    file_content = await zip_file.read()
+def detect_upload_kind(upload: UploadFile) -> UploadKind:
+    """
+    Find the kind of a file in a bulk upload from its content type or name.
+    """
+    for kind in UPLOAD_KINDS.values():
+        if upload.content_type == kind.content_type:
+            return kind
+    for kind in UPLOAD_KINDS.values():
+        if (upload.filename or "").endswith(kind.extension):
+            return kind
+    raise HTTPException(
+        status_code=400, detail="Invalid file type. Only zip and CSV files are allowed."
+    )
+
+
+async def send_upload(
+    file_service_client: httpx.AsyncClient,
+    upload: UploadFile,
+    kind: UploadKind,
+    upload_index: UploadIndex | None = None,
+    caller: str = "",
+    force: bool = False,
+) -> dict | None:
+    """
+    Validate an upload and stream it to the file service.
+
+    CSV files are checked first by sniffing their head, so a malformed file
+    is rejected without sending it. When the same caller sent the same
+    content before, nothing is sent and the earlier upload is returned
+    instead; `force` sends it anyway.
+    """
+    validate_upload(upload, kind)
+    if kind is UPLOAD_KINDS["csv"] and CSV_PRECHECK:
+        try:
+            await check_csv(upload)
+        except CsvCheckError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    digest = None
+    if upload_index is not None:
+        digest = await hash_upload(upload)
+        previous = await upload_index.find(digest, kind.label, caller)
+        if previous is not None and not force:
+            return previous
 
     try:
-        response = await file_service_client.post(
-            "/api/v1/upload/zip",
-            files={"zip_file": (file_name, file_content)},
+        response = await forward_upload(
+            file_service_client, kind.url, kind.field_name, upload
         )
         response.raise_for_status()
-        return {"message": "Zip file uploaded successfully"}
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=503, detail=f"File service is unavailable: {str(e)}"
+        )
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
 
+    if upload_index is not None:
+        await upload_index.add(digest, kind.label, caller, upload.filename, upload.size)
+    return None
+
+
+def upload_result(kind: UploadKind, previous: dict | None) -> dict:
+    label = kind.label[:1].upper() + kind.label[1:]
+    if previous is None:
+        return {"message": f"{label} file uploaded successfully", "deduplicated": False}
+    return {
+        "message": f"{label} file was already uploaded, it was not sent again",
+        "deduplicated": True,
+        "previous_upload": {
+            "file_name": previous["file_name"],
+            "uploaded_at": datetime.fromtimestamp(
+                previous["uploaded_at"], timezone.utc
+            ),
+        },
+    }
+
+
+@router.post("/upload/zip", tags=["file"])
+async def upload_zip(
+    zip_file: UploadFile,
+    request: Request,
+    force: bool = False,
+    file_service_client: httpx.AsyncClient = Depends(get_file_service_client),
+    upload_index: UploadIndex | None = Depends(get_upload_index),
+):
+    """
+    Endpoint to upload zip data.
+
+    A file with the same content as an earlier upload is not sent again
+    unless `force` is set.
+    """
+    kind = UPLOAD_KINDS["zip"]
+    previous = await send_upload(
+        file_service_client, zip_file, kind, upload_index, caller_key(request), force
+    )
+    return upload_result(kind, previous)
+
 
 @router.post("/upload/csv", tags=["file"])
 async def upload_csv(
     csv_file: UploadFile,
+    request: Request,
+    force: bool = False,
     file_service_client: httpx.AsyncClient = Depends(get_file_service_client),
+    upload_index: UploadIndex | None = Depends(get_upload_index),
 ):
     """
     Endpoint to upload CSV data.
+
+    A file with the same content as an earlier upload is not sent again
+    unless `force` is set.
+    """
+    kind = UPLOAD_KINDS["csv"]
+    previous = await send_upload(
+        file_service_client, csv_file, kind, upload_index, caller_key(request), force
+    )
+    return upload_result(kind, previous)
+
+
+@router.post(
+    "/upload/csv/preview", tags=["file"], response_model=file_schemas.CsvSchema
+)
+async def preview_csv(
+    csv_file: UploadFile,
+    rows: int = Query(10, ge=1, le=CSV_PREVIEW_MAX_ROWS),
+):
+    """
+    Endpoint to detect the encoding, delimiter and columns of a CSV file and
+    return its first rows, without uploading it.
+
+    Only the head of the file is read.
     """
-    if not csv_file or csv_file.content_type != "text/csv":
+    validate_upload(csv_file, UPLOAD_KINDS["csv"])
+    try:
+        return await check_csv(csv_file, sample_rows=rows)
+    except CsvCheckError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.post("/upload/bulk", tags=["file"])
+async def upload_bulk(
+    files: list[UploadFile],
+    request: Request,
+    force: bool = False,
+    file_service_client: httpx.AsyncClient = Depends(get_file_service_client),
+    upload_index: UploadIndex | None = Depends(get_upload_index),
+):
+    """
+    Endpoint to upload many zip and CSV files in one request.
+
+    The files are streamed to the file service, at most
+    UPLOAD_BULK_CONCURRENCY at a time. A failed file does not fail the
+    others; the response has the result of every file.
+    """
+    if len(files) > UPLOAD_BULK_MAX_FILES:
         raise HTTPException(
-            status_code=400, detail="Invalid file type. Only CSV files are allowed."
+            status_code=400,
+            detail=f"At most {UPLOAD_BULK_MAX_FILES} files can be uploaded at once",
         )
 
-    file_name = csv_file.filename
+    caller = caller_key(request)
+    slots = asyncio.Semaphore(UPLOAD_BULK_CONCURRENCY)
+
+    async def upload_one(upload: UploadFile) -> dict:
+        result = {"file_name": upload.filename, "size": upload.size}
+        async with slots:
+            start_time = time.perf_counter()
+            try:
+                previous = await send_upload(
+                    file_service_client,
+                    upload,
+                    detect_upload_kind(upload),
+                    upload_index,
+                    caller,
+                    force,
+                )
+                status = "uploaded" if previous is None else "deduplicated"
+                result.update(status=status, status_code=200)
+            except HTTPException as e:
+                result.update(
+                    status="failed", status_code=e.status_code, detail=e.detail
+                )
+            result["duration_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+        return result
 
-    if not file_name.endswith(".csv"):
-        raise HTTPException(status_code=400, detail="File is not a CSV file")
+    results = await asyncio.gather(*(upload_one(upload) for upload in files))
+    statuses = [result["status"] for result in results]
+    return {
+        "uploaded": statuses.count("uploaded"),
+        "deduplicated": statuses.count("deduplicated"),
+        "failed": statuses.count("failed"),
+        "files": results,
+    }
 
-    file_content = await csv_file.read()
 
+async def run_process(
+    file_service_client: httpx.AsyncClient,
+    body: file_schemas.ProcessDataRequest,
+    statement_prefetcher: PagePrefetcher,
+    analytics_cache: TTLCache,
+) -> dict:
+    """
+    Ask the file service to process a file and wait for the result.
+
+    Processing creates statements, so the prefetched statement pages and the
+    cached analytics are dropped once it succeeds.
+    """
     try:
         response = await file_service_client.post(
-            "/api/v1/upload/csv", files={"csv_file": (file_name, file_content)}
+            "/api/v1/process",
+            json={
+                "file_name": body.file_name,
+                "delimiter": body.delimiter,
+            },
         )
         response.raise_for_status()
-        return {"message": "CSV file uploaded successfully"}
+        statement_prefetcher.clear()
+        analytics_cache.clear()
+        return {"message": "File processed successfully", "data": response.json()}
+    except httpx.RequestError as e:
+        raise JobFailedError(503, f"File service is unavailable: {str(e)}")
     except httpx.HTTPStatusError as e:
-        raise HTTPException(status_code=e.response.status_code, detail=str(e))
+        raise JobFailedError(e.response.status_code, str(e))
 
 
 @router.post("/process")
 async def process_file(
     body: file_schemas.ProcessDataRequest,
+    mode: Literal["sync", "async"] = "sync",
     file_service_client: httpx.AsyncClient = Depends(get_file_service_client),
+    process_jobs: JobManager = Depends(get_process_jobs),
+    statement_prefetcher: PagePrefetcher = Depends(get_statement_prefetcher),
+    analytics_cache: TTLCache = Depends(get_analytics_cache),
 ):
     """
     Endpoint to process a file by its ID.
+
+    With `mode=async` the file is processed in the background and a job id
+    is returned at once; poll `/process/{job_id}` or follow
+    `/process/{job_id}/events` for the result. If too many jobs are still
+    queued or running, 503 is returned and the request can be retried later.
     """
-    try:
-        response = await file_service_client.post(
-            "/api/v1/process",
-            json={
-                "file_name": body.file_name,
-                "delimiter": body.delimiter,
+    process = partial(
+        run_process, file_service_client, body, statement_prefetcher, analytics_cache
+    )
+    if mode == "async":
+        try:
+            job = process_jobs.submit(process)
+        except JobLimitError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Too many files are being processed: {str(e)}",
+            )
+        return ORJSONResponse(
+            {
+                "job_id": job.id,
+                "status": job.status,
+                "status_url": f"/api/v1/process/{job.id}",
+                "events_url": f"/api/v1/process/{job.id}/events",
             },
+            status_code=202,
         )
-        response.raise_for_status()
-        return {"message": "File processed successfully", "data": response.json()}
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(status_code=e.response.status_code, detail=str(e))
+
+    try:
+        return await process()
+    except JobFailedError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+
+@router.get("/process/{job_id}")
+async def get_process_job(
+    job_id: str,
+    process_jobs: JobManager = Depends(get_process_jobs),
+):
+    """
+    Get the status, timing and result of a background processing job.
+    """
+    job = process_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_dict()
+
+
+@router.get("/process/{job_id}/events")
+async def get_process_job_events(
+    job_id: str,
+    process_jobs: JobManager = Depends(get_process_jobs),
+):
+    """
+    Server-sent events with the job's status until it is finished.
+    """
+    job = process_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return StreamingResponse(
+        job_events(job, PROCESS_EVENTS_KEEPALIVE),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 @router.get("/files/raw")
@@ -100,6 +379,6 @@ async def get_csv_files(
     try:
         response = await file_service_client.get("/api/v1/files/raw")
         response.raise_for_status()
-        return response.json()
+        return forward_response(response, "get_csv_files")
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
@@ -1,94 +1,135 @@
+import asyncio
+import time
+
 import httpx
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 
 import finances_bff.utils as utils
+from finances_bff.cache import TTLCache
+from finances_bff.clients import transport_stats
+from finances_bff.config import HEALTH_CACHE_TTL, HEALTH_CHECK_TIMEOUTS
+from finances_bff.paging import PagePrefetcher
 
 router = APIRouter()
 
 
-@router.get("/health", tags=["health"])
-async def health_check(
-    account_service_client: httpx.AsyncClient = Depends(
-        utils.get_account_service_client
-    ),
-    file_service_client: httpx.AsyncClient = Depends(utils.get_file_service_client),
-    statement_service_client: httpx.AsyncClient = Depends(
-        utils.get_statement_service_client
-    ),
-    tag_service_client: httpx.AsyncClient = Depends(utils.get_tag_service_client),
-):
+class HealthSnapshot:
     """
-    Health check endpoint for the BFF.
+    Last result of the aggregate health check and the check currently running.
     """
 
-    response = {"status": "ok", "services": {}}
-    try:
-        account_response = await account_service_client.get("/health")
+    def __init__(self):
+        self.result: dict | None = None
+        self.checked_at = 0.0
+        self.task: asyncio.Task | None = None
 
-        account_response.raise_for_status()
-        response["services"]["account_service"] = account_response.json()
-    except httpx.RequestError as e:
-        response["services"]["account_service"] = {
-            "status": "error",
-            "message": f"Account service is unavailable: {str(e)}",
-        }
-    except httpx.HTTPStatusError as e:
-        response["services"]["account_service"] = {
-            "status": "error",
-            "message": str(e),
-            "status_code": e.response.status_code,
-        }
 
+def get_health_snapshot(request: Request) -> HealthSnapshot:
+    """
+    Get the health snapshot from the request's app state.
+    """
+    if not hasattr(request.app.state, "health_snapshot"):
+        request.app.state.health_snapshot = HealthSnapshot()
+    return request.app.state.health_snapshot
+
+
+async def check_service(label: str, client: httpx.AsyncClient, timeout: float) -> dict:
+    """
+    Call the /health endpoint of a service within the given deadline.
+    """
+    start_time = time.perf_counter()
     try:
-        file_response = await file_service_client.get("/health")
-        file_response.raise_for_status()
-        response["services"]["file_service"] = file_response.json()
-    except httpx.RequestError as e:
-        response["services"]["file_service"] = {
-            "status": "error",
-            "message": f"File service is unavailable: {str(e)}",
-        }
-    except httpx.HTTPStatusError as e:
-        response["services"]["file_service"] = {
+        response = await asyncio.wait_for(client.get("/health"), timeout)
+        response.raise_for_status()
+        result = response.json()
+        if not isinstance(result, dict):
+            raise TypeError(f"expected a JSON object, got {type(result).__name__}")
+    except asyncio.TimeoutError:
+        result = {
             "status": "error",
-            "message": str(e),
-            "status_code": e.response.status_code,
+            "message": f"{label} service did not respond within {timeout}s",
         }
-
-    try:
-        statement_response = await statement_service_client.get("/health")
-        statement_response.raise_for_status()
-        response["services"]["statement_service"] = statement_response.json()
     except httpx.RequestError as e:
-        response["services"]["statement_service"] = {
+        result = {
             "status": "error",
-            "message": f"Statement service is unavailable: {str(e)}",
+            "message": f"{label} service is unavailable: {str(e)}",
         }
     except httpx.HTTPStatusError as e:
-        response["services"]["statement_service"] = {
+        result = {
             "status": "error",
             "message": str(e),
             "status_code": e.response.status_code,
         }
-
-    try:
-        tag_response = await tag_service_client.get("/health")
-        tag_response.raise_for_status()
-        response["services"]["tag_service"] = tag_response.json()
-
-    except httpx.RequestError as e:
-        response["services"]["tag_service"] = {
-            "status": "error",
-            "message": f"Tag service is unavailable: {str(e)}",
-        }
-    except httpx.HTTPStatusError as e:
-        response["services"]["tag_service"] = {
+    except (ValueError, TypeError) as e:
+        result = {
             "status": "error",
-            "message": str(e),
-            "status_code": e.response.status_code,
+            "message": f"{label} service sent an invalid health response: {str(e)}",
         }
 
-    return response
+    result["latency_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+    return result
+
+
+async def run_health_checks(
+    snapshot: HealthSnapshot, clients: dict[str, tuple[str, httpx.AsyncClient]]
+) -> dict:
+    """
+    Check all services concurrently and store the result in the snapshot.
+    """
+    names = list(clients)
+    results = await asyncio.gather(
+        *(
+            check_service(label, client, HEALTH_CHECK_TIMEOUTS[name])
+            for name, (label, client) in clients.items()
+        )
+    )
+
+    snapshot.result = {"status": "ok", "services": dict(zip(names, results))}
+    snapshot.checked_at = time.monotonic()
+    return snapshot.result
+
+
+@router.get("/health", tags=["health"])
+async def health_check(
+    account_service_client: httpx.AsyncClient = Depends(
+        utils.get_account_service_client
+    ),
+    file_service_client: httpx.AsyncClient = Depends(utils.get_file_service_client),
+    statement_service_client: httpx.AsyncClient = Depends(
+        utils.get_statement_service_client
+    ),
+    tag_service_client: httpx.AsyncClient = Depends(utils.get_tag_service_client),
+    snapshot: HealthSnapshot = Depends(get_health_snapshot),
+):
+    """
+    Health check endpoint for the BFF.
+
+    The services are checked concurrently and the result is reused for
+    HEALTH_CACHE_TTL seconds. Probes arriving while a check is running get
+    the previous result, or wait for the running check if there is none yet.
+    """
+    if (
+        snapshot.result is not None
+        and time.monotonic() - snapshot.checked_at < HEALTH_CACHE_TTL
+    ):
+        return snapshot.result
+
+    if snapshot.task is None or snapshot.task.done():
+        snapshot.task = asyncio.create_task(
+            run_health_checks(
+                snapshot,
+                {
+                    "account_service": ("Account", account_service_client),
+                    "file_service": ("File", file_service_client),
+                    "statement_service": ("Statement", statement_service_client),
+                    "tag_service": ("Tag", tag_service_client),
+                },
+            )
+        )
+    elif snapshot.result is not None:
+        return snapshot.result
+
+    return await asyncio.shield(snapshot.task)
 
 
 @router.get("/account/health", tags=["health"])
@@ -169,3 +210,38 @@ async def tags_health_check(
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
     return {"status": "ok", "tag_service": response.json()}
+
+
+@router.get("/cache/stats", tags=["health"])
+async def cache_stats(
+    tag_cache: TTLCache = Depends(utils.get_tag_cache),
+    account_cache: TTLCache = Depends(utils.get_account_cache),
+    dashboard_cache: TTLCache = Depends(utils.get_dashboard_cache),
+    analytics_cache: TTLCache = Depends(utils.get_analytics_cache),
+    statement_prefetcher: PagePrefetcher = Depends(utils.get_statement_prefetcher),
+):
+    """
+    Hit and miss counters of the in-process caches.
+    """
+    return {
+        "tag_cache": tag_cache.stats(),
+        "account_cache": account_cache.stats(),
+        "dashboard_cache": dashboard_cache.stats(),
+        "analytics_cache": analytics_cache.stats(),
+        "statement_pages": statement_prefetcher.cache.stats(),
+    }
+
+
+@router.get("/clients/stats", tags=["health"])
+async def client_stats(
+    service_transports: dict[str, httpx.AsyncBaseTransport] = Depends(
+        utils.get_service_transports
+    ),
+):
+    """
+    Connection pool usage of the downstream service clients.
+    """
+    return {
+        f"{service}_service": transport_stats(transport)
+        for service, transport in service_transports.items()
+    }
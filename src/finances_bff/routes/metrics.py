@@ -0,0 +1,101 @@
+import httpx
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+import finances_bff.utils as utils
+from finances_bff.cache import TTLCache
+from finances_bff.clients import transport_stats
+from finances_bff.jobs import JobManager
+from finances_bff.metrics import Registry, registry
+from finances_bff.paging import PagePrefetcher
+from finances_bff.resilience import CircuitBreaker
+
+router = APIRouter()
+
+BREAKER_STATES = (CircuitBreaker.CLOSED, CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN)
+
+
+def collect_state(
+    caches: dict[str, TTLCache],
+    service_transports: dict[str, httpx.AsyncBaseTransport],
+    process_jobs: JobManager,
+) -> Registry:
+    """
+    Read the cache and downstream client counters into scrape-time metrics.
+    """
+    state = Registry()
+
+    cache_size = state.gauge("bff_cache_size", "Entries in the cache.", ("cache",))
+    cache_counters = {
+        key: state.counter(f"bff_cache_{key}_total", f"Cache {key}.", ("cache",))
+        for key in ("hits", "misses", "evictions")
+    }
+    for name, cache in caches.items():
+        stats = cache.stats()
+        cache_size.set(name, value=stats["size"])
+        for key, counter in cache_counters.items():
+            counter.inc(name, amount=stats[key])
+
+    breaker_state = state.gauge(
+        "bff_downstream_breaker_state",
+        "Circuit breaker state of each service, 1 for the current state.",
+        ("service", "state"),
+    )
+    client_metrics = {}
+    for service, transport in service_transports.items():
+        for key, value in transport_stats(transport).items():
+            if key == "breaker_state":
+                for breaker in BREAKER_STATES:
+                    breaker_state.set(service, breaker, value=int(value == breaker))
+                continue
+            if key not in client_metrics:
+                client_metrics[key] = state.gauge(
+                    f"bff_downstream_{key}",
+                    f"Downstream client {key.replace('_', ' ')}.",
+                    ("service",),
+                )
+            client_metrics[key].set(service, value=value)
+
+    jobs = process_jobs.stats()
+    process_jobs_gauge = state.gauge(
+        "bff_process_jobs", "Background /process jobs kept, by status.", ("status",)
+    )
+    process_jobs_gauge.set("queued", value=jobs["queued"])
+    process_jobs_gauge.set("running", value=jobs["running"])
+    process_jobs_gauge.set(
+        "finished", value=jobs["jobs"] - jobs["queued"] - jobs["running"]
+    )
+
+    return state
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(
+    tag_cache: TTLCache = Depends(utils.get_tag_cache),
+    account_cache: TTLCache = Depends(utils.get_account_cache),
+    dashboard_cache: TTLCache = Depends(utils.get_dashboard_cache),
+    analytics_cache: TTLCache = Depends(utils.get_analytics_cache),
+    statement_prefetcher: PagePrefetcher = Depends(utils.get_statement_prefetcher),
+    service_transports: dict[str, httpx.AsyncBaseTransport] = Depends(
+        utils.get_service_transports
+    ),
+    process_jobs: JobManager = Depends(utils.get_process_jobs),
+):
+    """
+    Metrics in the Prometheus text format.
+    """
+    state = collect_state(
+        {
+            "tag": tag_cache,
+            "account": account_cache,
+            "dashboard": dashboard_cache,
+            "analytics": analytics_cache,
+            "statement_pages": statement_prefetcher.cache,
+        },
+        service_transports,
+        process_jobs,
+    )
+    return PlainTextResponse(
+        registry.render() + state.render(),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -1,8 +1,33 @@
+from functools import partial
+
 import httpx
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 
-from finances_bff.utils import get_statement_service_client
+from finances_bff.analytics import StatementAnalytics
+from finances_bff.cache import TTLCache
+from finances_bff.config import (
+    STATEMENT_CURSOR_OVERFETCH,
+    STATEMENT_EXPORT_PAGE_SIZE,
+    STATEMENT_PREFETCH,
+    TIMESERIES_MAX_POINTS,
+)
+from finances_bff.export import EXPORT_MEDIA_TYPES, stream_statements
+from finances_bff.paging import (
+    PagePrefetcher,
+    StatementCursor,
+    fetch_cursor_page,
+    filters_digest,
+    iter_statement_pages,
+)
+from finances_bff.proxy import Payload, forward_response, respond
 from finances_bff.schemas import statement as statement_schemas
+from finances_bff.timeseries import StatementTimeSeries
+from finances_bff.utils import (
+    get_analytics_cache,
+    get_statement_prefetcher,
+    get_statement_service_client,
+)
 
 router = APIRouter()
 
@@ -11,6 +36,8 @@ router = APIRouter()
 async def create_statement(
     statement: statement_schemas.StatementCreate,
     statement_service_client: httpx.AsyncClient = Depends(get_statement_service_client),
+    statement_prefetcher: PagePrefetcher = Depends(get_statement_prefetcher),
+    analytics_cache: TTLCache = Depends(get_analytics_cache),
 ):
     """
     Create a new statement.
@@ -21,6 +48,8 @@ async def create_statement(
             json=statement.model_dump(mode="json", exclude_unset=True),
         )
         response.raise_for_status()
+        statement_prefetcher.clear()
+        analytics_cache.clear()
         return response.json()
     except httpx.RequestError as e:
         raise HTTPException(
@@ -30,15 +59,86 @@ async def create_statement(
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
 
 
+async def list_statements_by_cursor(
+    params_dict: dict,
+    statement_service_client: httpx.AsyncClient,
+    statement_prefetcher: PagePrefetcher,
+    response: Response,
+):
+    """
+    Get a page of a cursor listing, from the prefetched pages when possible,
+    and start prefetching the page after it.
+    """
+    cursor_value = params_dict.pop("cursor")
+    limit = params_dict.pop("limit")
+    params_dict.pop("skip")
+    digest = filters_digest(params_dict)
+
+    cursor = None
+    if cursor_value:
+        try:
+            cursor = StatementCursor.decode(cursor_value)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if cursor.filters != digest:
+            raise HTTPException(
+                status_code=400, detail="Cursor belongs to different filters"
+            )
+
+    def fetch(cursor: StatementCursor | None):
+        return fetch_cursor_page(
+            statement_service_client,
+            params_dict,
+            limit,
+            cursor,
+            STATEMENT_CURSOR_OVERFETCH,
+        )
+
+    result = await statement_prefetcher.get((digest, cursor_value, limit))
+    if result is None:
+        result = await fetch(cursor)
+    page, next_cursor = result
+
+    headers = {}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor
+        if STATEMENT_PREFETCH:
+            statement_prefetcher.prefetch(
+                (digest, next_cursor, limit),
+                partial(fetch, StatementCursor.decode(next_cursor)),
+            )
+
+    result = respond(Payload.from_data(page), "list_statements")
+    # Headers set on `response` only reach plain return values.
+    response.headers.update(headers)
+    if isinstance(result, Response):
+        result.headers.update(headers)
+    return result
+
+
 @router.get("/statements/", response_model=list[statement_schemas.StatementExtended])
 async def list_statements(
+    http_response: Response,
     params: statement_schemas.StatementFilters = Depends(),
     statement_service_client: httpx.AsyncClient = Depends(get_statement_service_client),
+    statement_prefetcher: PagePrefetcher = Depends(get_statement_prefetcher),
 ):
     """
     Get all statements with optional filters.
+
+    With `cursor` the statements are listed newest first by (date, id), and
+    the cursor of the next page is sent in the X-Next-Cursor header; it is
+    missing on the last page. Start with an empty `cursor`.
     """
     try:
+        if params.cursor is not None:
+            return await list_statements_by_cursor(
+                params.model_dump(mode="json", exclude_none=True),
+                statement_service_client,
+                statement_prefetcher,
+                http_response,
+            )
+
         params_dict = params.model_dump(exclude_unset=True)
 
         params_dict = {k: v for k, v in params_dict.items() if v is not None}
@@ -47,7 +147,7 @@ async def list_statements(
             "/api/v1/statements/", params=params_dict
         )
         response.raise_for_status()
-        return response.json()
+        return forward_response(response, "list_statements")
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=503, detail=f"Statement service is unavailable: {str(e)}"
@@ -56,6 +156,129 @@ async def list_statements(
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
 
 
+@router.get("/statements/export")
+async def export_statements(
+    params: statement_schemas.StatementExportFilters = Depends(),
+    statement_service_client: httpx.AsyncClient = Depends(get_statement_service_client),
+):
+    """
+    Stream every statement matching the filters as NDJSON or CSV.
+
+    The statement service is paged through internally, STATEMENT_EXPORT_PAGE_SIZE
+    statements at a time, with the next page fetched while the current one is
+    sent, so memory use does not depend on the size of the export.
+    """
+    params_dict = params.model_dump(mode="json", exclude_none=True)
+    export_format = params_dict.pop("format")
+
+    pages = iter_statement_pages(
+        statement_service_client, params_dict, STATEMENT_EXPORT_PAGE_SIZE
+    )
+    # Fetch the first page before the response starts, so a failing service
+    # still gets a proper error status.
+    try:
+        first_page = await anext(pages)
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=503, detail=f"Statement service is unavailable: {str(e)}"
+        )
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=str(e))
+
+    return StreamingResponse(
+        stream_statements(first_page, pages, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="statements.{export_format}"'
+            )
+        },
+    )
+
+
+@router.get(
+    "/statements/analytics", response_model=statement_schemas.StatementAnalyticsOut
+)
+async def statement_analytics(
+    params: statement_schemas.StatementRangeFilters = Depends(),
+    statement_service_client: httpx.AsyncClient = Depends(get_statement_service_client),
+    analytics_cache: TTLCache = Depends(get_analytics_cache),
+):
+    """
+    Totals of the statements matching the filters, by month, tag and account.
+
+    Every matching statement is paged through and aggregated here, so reports
+    get the sums instead of the rows. Results are cached by filter set for
+    ANALYTICS_CACHE_TTL seconds.
+    """
+    params_dict = params.model_dump(mode="json", exclude_none=True)
+    cache_key = filters_digest(params_dict)
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return respond(cached, "statement_analytics")
+
+    analytics = StatementAnalytics()
+    try:
+        await analytics.add_pages(
+            iter_statement_pages(
+                statement_service_client, params_dict, STATEMENT_EXPORT_PAGE_SIZE
+            )
+        )
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=503, detail=f"Statement service is unavailable: {str(e)}"
+        )
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=str(e))
+
+    payload = Payload.from_data(analytics.to_dict())
+    analytics_cache.set(cache_key, payload)
+    return respond(payload, "statement_analytics")
+
+
+@router.get("/statements/timeseries", response_model=statement_schemas.TimeSeriesOut)
+async def statement_timeseries(
+    params: statement_schemas.TimeSeriesFilters = Depends(),
+    max_points: int | None = Query(None, ge=3, le=TIMESERIES_MAX_POINTS),
+    statement_service_client: httpx.AsyncClient = Depends(get_statement_service_client),
+):
+    """
+    Amounts or running balance of each account per day, week or month.
+
+    Every matching statement is paged through and bucketed here. With
+    `max_points` each account's series is downsampled to at most that many
+    points, so long ranges stay small enough to chart.
+    """
+    params_dict = params.model_dump(
+        mode="json", exclude_none=True, exclude={"bucket", "metric"}
+    )
+
+    timeseries = StatementTimeSeries(params.bucket)
+    try:
+        await timeseries.add_pages(
+            iter_statement_pages(
+                statement_service_client, params_dict, STATEMENT_EXPORT_PAGE_SIZE
+            )
+        )
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=503, detail=f"Statement service is unavailable: {str(e)}"
+        )
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=str(e))
+
+    return respond(
+        Payload.from_data(
+            {
+                "bucket": params.bucket,
+                "metric": params.metric,
+                "series": timeseries.series(params.metric, max_points),
+            }
+        ),
+        "statement_timeseries",
+    )
+
+
 @router.get(
     "/statements/{statement_id}", response_model=statement_schemas.StatementExtended
 )
@@ -71,7 +294,7 @@ async def get_one_statement(
             f"/api/v1/statements/{statement_id}"
         )
         response.raise_for_status()
-        return response.json()
+        return forward_response(response, "get_one_statement")
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=503, detail=f"Statement service is unavailable: {str(e)}"
@@ -85,6 +308,8 @@ async def update_statement(
     statement_id: str,
     statement: statement_schemas.StatementUpdate,
     statement_service_client: httpx.AsyncClient = Depends(get_statement_service_client),
+    statement_prefetcher: PagePrefetcher = Depends(get_statement_prefetcher),
+    analytics_cache: TTLCache = Depends(get_analytics_cache),
 ):
     """
     Update an existing statement by ID.
@@ -95,6 +320,8 @@ async def update_statement(
             json=statement.model_dump(mode="json", exclude_unset=True),
         )
         response.raise_for_status()
+        statement_prefetcher.clear()
+        analytics_cache.clear()
         return response.json()
     except httpx.RequestError as e:
         raise HTTPException(
@@ -108,6 +335,8 @@ async def update_statement(
 async def delete_statement(
     statement_id: str,
     statement_service_client: httpx.AsyncClient = Depends(get_statement_service_client),
+    statement_prefetcher: PagePrefetcher = Depends(get_statement_prefetcher),
+    analytics_cache: TTLCache = Depends(get_analytics_cache),
 ):
     """
     Delete a statement by ID.
@@ -117,6 +346,8 @@ async def delete_statement(
             f"/api/v1/statements/{statement_id}"
         )
         response.raise_for_status()
+        statement_prefetcher.clear()
+        analytics_cache.clear()
         return {"ok": True}
     except httpx.RequestError as e:
         raise HTTPException(
@@ -1,23 +1,69 @@
 import httpx
 from fastapi import APIRouter, HTTPException, Depends
 
-from finances_bff.utils import get_tag_service_client
+from finances_bff.cache import TTLCache
+from finances_bff.proxy import Payload, respond
+from finances_bff.utils import get_tag_cache, get_tag_service_client
 from finances_bff.schemas import tag as tag_schemas
 
 router = APIRouter()
 
+TAG_LIST_KEY = "tags"
+
+
+def tag_entries(tag: dict, payload: Payload | None = None) -> list[tuple]:
+    """
+    Get the cache entries of a tag, under both its id and its name, as read_tag
+    accepts either.
+    """
+    payload = payload or Payload.from_data(tag)
+    groups = (tag["id"], tag["name"])
+    return [
+        (("tag", tag["id"]), payload, groups),
+        (("tag", tag["name"]), payload, groups),
+    ]
+
+
+def cache_tag(tag_cache: TTLCache, tag: dict, payload: Payload | None = None) -> None:
+    """
+    Cache a tag under both its id and its name.
+    """
+    for key, tag_payload, groups in tag_entries(tag, payload):
+        tag_cache.set(key, tag_payload, groups=groups)
+
+
+async def fetch_tags(
+    tag_service_client: httpx.AsyncClient, tag_cache: TTLCache
+) -> Payload:
+    """
+    Get all tags, from the cache when possible.
+    """
+    cached = tag_cache.get(TAG_LIST_KEY)
+    if cached is not None:
+        return cached
+
+    response = await tag_service_client.get("/api/v1/tags/")
+    response.raise_for_status()
+    payload = Payload.from_response(response)
+    # Build every entry before caching any, so a malformed body is not cached.
+    entries = [entry for tag in payload.json() for entry in tag_entries(tag)]
+    tag_cache.set(TAG_LIST_KEY, payload, groups=[TAG_LIST_KEY])
+    for key, tag_payload, groups in entries:
+        tag_cache.set(key, tag_payload, groups=groups)
+    return payload
+
 
 @router.get("/tags/", response_model=list[tag_schemas.TagOut])
 async def read_tags(
     tag_service_client: httpx.AsyncClient = Depends(get_tag_service_client),
+    tag_cache: TTLCache = Depends(get_tag_cache),
 ):
     """
     Get all tags.
     """
     try:
-        response = await tag_service_client.get("/api/v1/tags/")
-        response.raise_for_status()
-        return response.json()
+        payload = await fetch_tags(tag_service_client, tag_cache)
+        return respond(payload, "read_tags")
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=503, detail=f"Tag service is unavailable: {str(e)}"
@@ -30,14 +76,21 @@ async def read_tags(
 async def read_tag(
     tag_id_or_name: str,
     tag_service_client: httpx.AsyncClient = Depends(get_tag_service_client),
+    tag_cache: TTLCache = Depends(get_tag_cache),
 ):
     """
     Get a tag by ID or name.
     """
+    cached = tag_cache.get(("tag", tag_id_or_name))
+    if cached is not None:
+        return respond(cached, "read_tag")
+
     try:
         response = await tag_service_client.get(f"/api/v1/tags/{tag_id_or_name}")
         response.raise_for_status()
-        return response.json()
+        payload = Payload.from_response(response)
+        cache_tag(tag_cache, payload.json(), payload)
+        return respond(payload, "read_tag")
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=503, detail=f"Tag service is unavailable: {str(e)}"
@@ -50,6 +103,7 @@ async def read_tag(
 async def create_tag(
     tag: tag_schemas.TagCreate,
     tag_service_client: httpx.AsyncClient = Depends(get_tag_service_client),
+    tag_cache: TTLCache = Depends(get_tag_cache),
 ):
     """
     Create a new tag.
@@ -59,6 +113,7 @@ async def create_tag(
         tag_json = tag.model_dump(exclude_unset=True)
         response = await tag_service_client.post("/api/v1/tags/", json=tag_json)
         response.raise_for_status()
+        tag_cache.invalidate(TAG_LIST_KEY)
         return response.json()
     except httpx.RequestError as e:
         raise HTTPException(
@@ -73,6 +128,7 @@ async def update_tag(
     tag_id: str,
     tag: tag_schemas.TagUpdate,
     tag_service_client: httpx.AsyncClient = Depends(get_tag_service_client),
+    tag_cache: TTLCache = Depends(get_tag_cache),
 ):
     """
     Update an existing tag by ID.
@@ -88,12 +144,15 @@ async def update_tag(
         )
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
+    finally:
+        tag_cache.invalidate(TAG_LIST_KEY, tag_id, tag.name)
 
 
 @router.delete("/tags/{tag_id}")
 async def delete_tag(
     tag_id: str,
     tag_service_client: httpx.AsyncClient = Depends(get_tag_service_client),
+    tag_cache: TTLCache = Depends(get_tag_cache),
 ):
     """
     Delete a tag by ID.
@@ -108,3 +167,5 @@ async def delete_tag(
         )
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
+    finally:
+        tag_cache.invalidate(TAG_LIST_KEY, tag_id)
@@ -0,0 +1,19 @@
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class BatchSubRequest(BaseModel):
+    """
+    One API call in a batch, with a path such as `/api/v1/accounts/`.
+    """
+
+    id: Optional[str] = None
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str
+    params: dict[str, Any] = {}
+    body: Any = None
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchSubRequest]
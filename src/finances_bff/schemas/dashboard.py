@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from finances_bff.schemas.account import AccountOut
+from finances_bff.schemas.statement import StatementExtended
+from finances_bff.schemas.tag import TagOut
+
+
+class DashboardFilters(BaseModel):
+    account_iban: Optional[str] = None
+    after_date: Optional[datetime] = None
+    before_date: Optional[datetime] = None
+    # Number of recent statements to show.
+    limit: int = Field(10, ge=1, le=100)
+
+
+class DashboardSummary(BaseModel):
+    after_date: datetime
+    before_date: Optional[datetime] = None
+    count: int
+    income: int
+    expenses: int
+    net: int
+    # True when the period has more statements than were summed.
+    truncated: bool
+
+
+class DashboardOut(BaseModel):
+    accounts: Optional[list[AccountOut]] = None
+    tags: Optional[list[TagOut]] = None
+    recent_statements: Optional[list[StatementExtended]] = None
+    summary: Optional[DashboardSummary] = None
+    # Message of each section that could not be loaded; that section is null.
+    errors: dict[str, str] = {}
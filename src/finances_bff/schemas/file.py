@@ -8,3 +8,15 @@ class ProcessDataRequest(BaseModel):
 
     file_name: str
     delimiter: str = ";"
+
+
+class CsvSchema(BaseModel):
+    """
+    Format of a CSV file, sniffed from its first rows.
+    """
+
+    encoding: str
+    delimiter: str
+    columns: list[str]
+    column_count: int
+    rows: list[list[str]] = []
@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -66,3 +66,62 @@ class StatementFilters(BaseModel):
     max_amount: Optional[int] = None
     limit: int = 100
     skip: int = 0
+    # Opaque position returned in X-Next-Cursor; an empty value starts a
+    # cursor listing. Cursor listings ignore `skip`.
+    cursor: Optional[str] = None
+
+
+class StatementRangeFilters(BaseModel):
+    before_date: Optional[datetime] = None
+    after_date: Optional[datetime] = None
+    account_iban: Optional[str] = None
+    min_amount: Optional[int] = None
+    max_amount: Optional[int] = None
+
+
+class StatementExportFilters(StatementRangeFilters):
+    format: Literal["ndjson", "csv"] = "ndjson"
+
+
+class StatementGroupStats(BaseModel):
+    count: int
+    sum: int
+    min: Optional[int] = None
+    max: Optional[int] = None
+    income: int
+    income_count: int
+    expenses: int
+    expense_count: int
+
+
+class StatementGroup(StatementGroupStats):
+    key: Optional[str] = None
+
+
+class StatementAnalyticsOut(BaseModel):
+    total: StatementGroupStats
+    by_month: list[StatementGroup]
+    by_tag: list[StatementGroup]
+    by_account: list[StatementGroup]
+
+
+class TimeSeriesFilters(StatementRangeFilters):
+    bucket: Literal["day", "week", "month"] = "day"
+    metric: Literal["amount", "balance"] = "amount"
+
+
+class TimeSeriesPoint(BaseModel):
+    date: date
+    value: int
+    count: int
+
+
+class TimeSeries(BaseModel):
+    account_iban: Optional[str] = None
+    points: list[TimeSeriesPoint]
+
+
+class TimeSeriesOut(BaseModel):
+    bucket: str
+    metric: str
+    series: list[TimeSeries]
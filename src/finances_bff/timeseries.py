@@ -0,0 +1,166 @@
+from datetime import date
+from itertools import accumulate
+from typing import AsyncIterator
+
+EMPTY_BUCKET = (0, 0)
+# Distance between the keys of adjacent buckets.
+BUCKET_STEPS = {"day": 1, "week": 7, "month": 1}
+
+
+def bucket_key(day: str, bucket: str) -> int:
+    """
+    Integer key of the bucket an ISO 8601 date falls in: the ordinal of its
+    day or of the Monday of its week, or the number of its month.
+    """
+    if bucket == "month":
+        return int(day[:4]) * 12 + int(day[5:7]) - 1
+    ordinal = date.fromisoformat(day[:10]).toordinal()
+    if bucket == "week":
+        # Ordinal 1, 0001-01-01, is a Monday.
+        return ordinal - (ordinal - 1) % 7
+    return ordinal
+
+
+def bucket_date(key: int, bucket: str) -> date:
+    """
+    First day of the bucket with this key.
+    """
+    if bucket == "month":
+        return date(key // 12, key % 12 + 1, 1)
+    return date.fromordinal(key)
+
+
+def lttb(values: list[int], threshold: int) -> list[int]:
+    """
+    Indexes of the evenly spaced values kept by Largest-Triangle-Three-Buckets.
+
+    The first and last values are always kept; from each bucket in between
+    the value forming the largest triangle with the previously kept one and
+    the average of the next bucket is kept, which keeps peaks and dips.
+    """
+    count = len(values)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+
+    kept = [0]
+    size = (count - 2) / (threshold - 2)
+    previous = 0
+    for i in range(threshold - 2):
+        start = int(i * size) + 1
+        end = int((i + 1) * size) + 1
+        next_end = min(int((i + 2) * size) + 1, count)
+        if next_end > end:
+            average_x = (end + next_end - 1) / 2
+            average_y = sum(values[end:next_end]) / (next_end - end)
+        else:
+            average_x, average_y = count - 1, values[-1]
+
+        previous_y = values[previous]
+        dx = previous - average_x
+        dy = average_y - previous_y
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(dx * (values[j] - previous_y) - (previous - j) * dy)
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        previous = best
+    kept.append(count - 1)
+    return kept
+
+
+class StatementTimeSeries:
+    """
+    Statement amounts per account and day, week or month bucket.
+
+    Pages are added one at a time and only the per-bucket sums are kept, so
+    memory depends on the number of buckets, not of statements.
+    """
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+        # Per account: bucket key -> [sum, count].
+        self.accounts: dict[str | None, dict[int, list[int]]] = {}
+
+    def add_page(self, page: list[dict]) -> None:
+        bucket = self.bucket
+        accounts = [statement.get("account_iban") for statement in page]
+        amounts = [statement["amount"] for statement in page]
+        keys = [bucket_key(statement["date"], bucket) for statement in page]
+        for account, key, amount in zip(accounts, keys, amounts):
+            buckets = self.accounts.get(account)
+            if buckets is None:
+                buckets = self.accounts[account] = {}
+            totals = buckets.get(key)
+            if totals is None:
+                buckets[key] = [amount, 1]
+            else:
+                totals[0] += amount
+                totals[1] += 1
+
+    async def add_pages(self, pages: AsyncIterator[list[dict]]) -> None:
+        async for page in pages:
+            self.add_page(page)
+
+    def columns(self, account: str | None, metric: str) -> tuple[list, list, list]:
+        """
+        Bucket keys, values and statement counts of an account, from its
+        first bucket to its last, with empty buckets filled in. For
+        "balance" the value is the running total since the start of the range.
+        """
+        buckets = self.accounts[account]
+        keys = range(min(buckets), max(buckets) + 1, BUCKET_STEPS[self.bucket])
+        totals = [buckets.get(key, EMPTY_BUCKET) for key in keys]
+        values = [amount for amount, _ in totals]
+        if metric == "balance":
+            values = list(accumulate(values))
+        return list(keys), values, [count for _, count in totals]
+
+    def series(self, metric: str, max_points: int | None = None) -> list[dict]:
+        """
+        The points of every account, at most `max_points` each.
+
+        Amounts are downsampled by adding up runs of adjacent buckets, which
+        keeps the totals. Balances are downsampled with LTTB, which keeps the
+        shape of the curve.
+        """
+        series = []
+        for account in sorted(self.accounts, key=lambda iban: (iban is None, iban)):
+            keys, values, counts = self.columns(account, metric)
+            if max_points is not None and len(keys) > max_points:
+                if metric == "balance":
+                    kept = lttb(values, max_points)
+                    keys = [keys[i] for i in kept]
+                    values = [values[i] for i in kept]
+                    counts = [counts[i] for i in kept]
+                else:
+                    keys, values, counts = merge_runs(keys, values, counts, max_points)
+            series.append(
+                {
+                    "account_iban": account,
+                    "points": [
+                        {
+                            "date": bucket_date(key, self.bucket),
+                            "value": value,
+                            "count": count,
+                        }
+                        for key, value, count in zip(keys, values, counts)
+                    ],
+                }
+            )
+        return series
+
+
+def merge_runs(
+    keys: list[int], values: list[int], counts: list[int], max_points: int
+) -> tuple[list, list, list]:
+    """
+    Add up runs of adjacent buckets so at most `max_points` remain.
+    """
+    size = -(-len(keys) // max_points)
+    indexes = range(0, len(keys), size)
+    return (
+        [keys[i] for i in indexes],
+        [sum(values[i : i + size]) for i in indexes],
+        [sum(counts[i : i + size]) for i in indexes],
+    )
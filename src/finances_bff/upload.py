@@ -0,0 +1,98 @@
+import secrets
+from typing import AsyncIterator
+
+import httpx
+from fastapi import UploadFile
+
+from finances_bff.config import MAX_UPLOAD_SIZE, UPLOAD_CHUNK_SIZE
+
+
+class UploadTooLargeError(Exception):
+    """
+    Raised when an upload is larger than the allowed maximum size.
+    """
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File is larger than the allowed {max_size} bytes")
+        self.max_size = max_size
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', "%22").replace("\n", "%0A")
+
+
+class MultipartUploadStream:
+    """
+    Stream a single uploaded file as a multipart/form-data request body.
+
+    The file is read in chunks of `chunk_size` bytes, so only one chunk of
+    the upload is held in memory at a time. The size limit is enforced while
+    the chunks are sent.
+    """
+
+    def __init__(
+        self,
+        field_name: str,
+        upload: UploadFile,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        max_size: int = MAX_UPLOAD_SIZE,
+    ):
+        self.upload = upload
+        self.chunk_size = chunk_size
+        self.max_size = max_size
+        self.boundary = secrets.token_hex(16)
+
+        content_type = upload.content_type or "application/octet-stream"
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote(field_name)}"; '
+            f'filename="{_quote(upload.filename or field_name)}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def content_length(self) -> int | None:
+        if self.upload.size is None:
+            return None
+        return len(self._head) + self.upload.size + len(self._tail)
+
+    def check_size(self) -> None:
+        """
+        Reject the upload before sending anything if its size is already known.
+        """
+        if self.upload.size is not None and self.upload.size > self.max_size:
+            raise UploadTooLargeError(self.max_size)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        await self.upload.seek(0)
+        yield self._head
+
+        sent = 0
+        while chunk := await self.upload.read(self.chunk_size):
+            sent += len(chunk)
+            if sent > self.max_size:
+                raise UploadTooLargeError(self.max_size)
+            yield chunk
+
+        yield self._tail
+
+
+async def forward_upload(
+    client: httpx.AsyncClient, url: str, field_name: str, upload: UploadFile
+) -> httpx.Response:
+    """
+    Send an uploaded file to a downstream service without buffering it.
+    """
+    stream = MultipartUploadStream(field_name, upload)
+    stream.check_size()
+
+    headers = {"Content-Type": stream.content_type}
+    if stream.content_length is not None:
+        headers["Content-Length"] = str(stream.content_length)
+
+    return await client.post(url, content=stream, headers=headers)
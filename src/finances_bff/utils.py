@@ -1,6 +1,24 @@
+import hashlib
+
 import httpx
 from fastapi import Request
 
+from finances_bff.cache import TTLCache
+from finances_bff.dedup import UploadIndex
+from finances_bff.jobs import JobManager
+from finances_bff.paging import PagePrefetcher
+
+
+def caller_key(request: Request) -> str:
+    """
+    Digest of the credentials a request carries, so data kept for one caller
+    is only reused for the same caller.
+    """
+    credentials = "\n".join(
+        request.headers.get(name, "") for name in ("authorization", "cookie")
+    )
+    return hashlib.blake2b(credentials.encode(), digest_size=16).hexdigest()
+
 
 async def get_tag_service_client(request: Request) -> httpx.AsyncClient:
     """
@@ -36,3 +54,78 @@ async def get_file_service_client(request: Request) -> httpx.AsyncClient:
     if not hasattr(request.app.state, "file_service_client"):
         raise ValueError("File service client is not initialized")
     return request.app.state.file_service_client
+
+
+async def get_tag_cache(request: Request) -> TTLCache:
+    """
+    Get the tag cache from the request's app state.
+    """
+    if not hasattr(request.app.state, "tag_cache"):
+        raise ValueError("Tag cache is not initialized")
+    return request.app.state.tag_cache
+
+
+async def get_account_cache(request: Request) -> TTLCache:
+    """
+    Get the account cache from the request's app state.
+    """
+    if not hasattr(request.app.state, "account_cache"):
+        raise ValueError("Account cache is not initialized")
+    return request.app.state.account_cache
+
+
+async def get_dashboard_cache(request: Request) -> TTLCache:
+    """
+    Get the dashboard cache from the request's app state.
+    """
+    if not hasattr(request.app.state, "dashboard_cache"):
+        raise ValueError("Dashboard cache is not initialized")
+    return request.app.state.dashboard_cache
+
+
+async def get_analytics_cache(request: Request) -> TTLCache:
+    """
+    Get the statement analytics cache from the request's app state.
+    """
+    if not hasattr(request.app.state, "analytics_cache"):
+        raise ValueError("Analytics cache is not initialized")
+    return request.app.state.analytics_cache
+
+
+async def get_statement_prefetcher(request: Request) -> PagePrefetcher:
+    """
+    Get the prefetched statement pages from the request's app state.
+    """
+    if not hasattr(request.app.state, "statement_prefetcher"):
+        raise ValueError("Statement prefetcher is not initialized")
+    return request.app.state.statement_prefetcher
+
+
+async def get_service_transports(
+    request: Request,
+) -> dict[str, httpx.AsyncBaseTransport]:
+    """
+    Get the transports of the downstream service clients from the app state.
+    """
+    if not hasattr(request.app.state, "service_transports"):
+        raise ValueError("Service clients are not initialized")
+    return request.app.state.service_transports
+
+
+async def get_process_jobs(request: Request) -> JobManager:
+    """
+    Get the manager of background /process jobs from the request's app state.
+    """
+    if not hasattr(request.app.state, "process_jobs"):
+        raise ValueError("Process job manager is not initialized")
+    return request.app.state.process_jobs
+
+
+async def get_upload_index(request: Request) -> UploadIndex | None:
+    """
+    Get the upload deduplication index from the request's app state, or None
+    when deduplication is disabled.
+    """
+    if not hasattr(request.app.state, "upload_index"):
+        raise ValueError("Upload index is not initialized")
+    return request.app.state.upload_index
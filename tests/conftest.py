@@ -1,6 +1,11 @@
 import os
 
+import httpx
 import pytest
+from fastapi.testclient import TestClient
+
+# Keep the upload index of the tests in memory instead of a file in the repo.
+os.environ.setdefault("UPLOAD_DEDUP_PATH", ":memory:")
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -12,3 +17,31 @@ def set_env_variables():
 
     print("Setting up environment variables for tests...")
     os.environ["LOG_LEVEL"] = "DEBUG"
+
+
+@pytest.fixture
+def bff_client(monkeypatch):
+    """
+    Build a TestClient of the app running against in-process stubs.
+
+    Call it with the transports that replace the network transport of the
+    named services, and use the client as a context manager to run the
+    lifespan. The service URLs and the stubs are undone after the test.
+    """
+
+    def make_client(
+        transports: dict[str, httpx.AsyncBaseTransport] | None = None,
+    ) -> TestClient:
+        # Imported here, as the settings are read on import and the upload
+        # index path above has to be set first.
+        from finances_bff.clients import SERVICES
+        from finances_bff.main import app
+
+        for service in SERVICES:
+            monkeypatch.setenv(f"{service.upper()}_SERVICE_URL", f"http://{service}")
+        monkeypatch.setattr(
+            app.state, "downstream_transports", transports or {}, raising=False
+        )
+        return TestClient(app)
+
+    return make_client
@@ -0,0 +1,97 @@
+import httpx
+import pytest
+
+from finances_bff.routes.account import ACCOUNT_LIST_KEY
+
+MAIN = "3f1c2f3e-1111-2222-3333-000000000001"
+ALIAS = "3f1c2f3e-1111-2222-3333-000000000002"
+OTHER = "3f1c2f3e-1111-2222-3333-000000000003"
+ACCOUNTS = {
+    account_id: {
+        "id": account_id,
+        "name": name,
+        "iban": f"HU0000000000000000000000000{i}",
+        "nickname": name.lower(),
+        "aliases": [],
+    }
+    for i, (account_id, name) in enumerate(
+        ((MAIN, "Main"), (ALIAS, "Alias"), (OTHER, "Other"))
+    )
+}
+
+ALL_ACCOUNTS = (ACCOUNT_LIST_KEY, (("all", True),))
+OTHER_ACCOUNTS = (ACCOUNT_LIST_KEY, (("all", True), ("name", "Other")))
+
+
+def account_service(request: httpx.Request) -> httpx.Response:
+    path = request.url.path.removeprefix("/api/v1/accounts/")
+    if request.method == "GET" and path == "":
+        name = request.url.params.get("name")
+        return httpx.Response(
+            200,
+            json=[
+                account
+                for account in ACCOUNTS.values()
+                if name is None or account["name"] == name
+            ],
+        )
+    if request.method == "GET":
+        return httpx.Response(200, json=ACCOUNTS[path])
+    if request.method == "PUT":
+        return httpx.Response(200, json=ACCOUNTS[path])
+    return httpx.Response(200, json={})
+
+
+def cached_after(bff_client, change) -> set:
+    """
+    Fill the account cache through the routes, make a change and return the
+    cache keys still present afterwards.
+    """
+    keys = [ALL_ACCOUNTS, OTHER_ACCOUNTS] + [
+        ("account", account_id) for account_id in ACCOUNTS
+    ]
+
+    with bff_client({"account": httpx.MockTransport(account_service)}) as client:
+        client.get("/api/v1/accounts/")
+        client.get("/api/v1/accounts/", params={"name": "Other"})
+        for account_id in ACCOUNTS:
+            client.get(f"/api/v1/accounts/{account_id}")
+        account_cache = client.app.state.account_cache
+        assert all(account_cache.get(key) is not None for key in keys)
+
+        response = change(client)
+        assert response.status_code == 200
+        remaining = {key for key in keys if account_cache.get(key) is not None}
+    return remaining
+
+
+def test_alias_creation_evicts_both_accounts_and_lists_with_them(bff_client):
+    remaining = cached_after(
+        bff_client,
+        lambda client: client.post(
+            "/api/v1/accounts/alias", json={"account_id": MAIN, "alias_id": ALIAS}
+        ),
+    )
+
+    assert remaining == {OTHER_ACCOUNTS, ("account", OTHER)}
+
+
+def test_update_evicts_the_account_and_every_list(bff_client):
+    account = {key: ACCOUNTS[OTHER][key] for key in ("name", "iban", "nickname")}
+    remaining = cached_after(
+        bff_client, lambda client: client.put(f"/api/v1/accounts/{OTHER}", json=account)
+    )
+
+    assert remaining == {("account", MAIN), ("account", ALIAS)}
+
+
+@pytest.mark.parametrize("account_id", [MAIN, OTHER])
+def test_delete_evicts_the_account_and_lists_with_it(bff_client, account_id):
+    remaining = cached_after(
+        bff_client, lambda client: client.delete(f"/api/v1/accounts/{account_id}")
+    )
+
+    expected = {("account", other) for other in ACCOUNTS if other != account_id}
+    if account_id == MAIN:
+        expected.add(OTHER_ACCOUNTS)
+    assert remaining == expected
@@ -0,0 +1,104 @@
+import httpx
+
+from finances_bff.analytics import StatementAnalytics
+
+
+def statement(date: str, amount: int, account: str, tags=()) -> dict:
+    return {
+        "date": date,
+        "amount": amount,
+        "account_iban": account,
+        "tags": [{"name": tag} for tag in tags],
+    }
+
+
+STATEMENTS = [
+    statement("2025-01-03T10:00:00", 1000, "HU01", ["salary"]),
+    statement("2025-01-20T10:00:00", -300, "HU01", ["food", "shared"]),
+    statement("2025-02-01T10:00:00", -200, "HU02"),
+]
+
+
+def test_statements_are_grouped_by_month_tag_and_account():
+    analytics = StatementAnalytics()
+    analytics.add_page(STATEMENTS[:2])
+    analytics.add_page(STATEMENTS[2:])
+    result = analytics.to_dict()
+
+    assert result["total"] == {
+        "count": 3,
+        "sum": 500,
+        "min": -300,
+        "max": 1000,
+        "income": 1000,
+        "income_count": 1,
+        "expenses": -500,
+        "expense_count": 2,
+    }
+    assert [(group["key"], group["sum"]) for group in result["by_month"]] == [
+        ("2025-01", 700),
+        ("2025-02", -200),
+    ]
+    assert [(group["key"], group["count"]) for group in result["by_tag"]] == [
+        ("food", 1),
+        ("salary", 1),
+        ("shared", 1),
+        (None, 1),
+    ]
+    assert [(group["key"], group["expenses"]) for group in result["by_account"]] == [
+        ("HU01", -300),
+        ("HU02", -200),
+    ]
+
+
+def test_empty_range_has_no_min_or_max():
+    result = StatementAnalytics().to_dict()
+    assert result["total"]["count"] == 0
+    assert result["total"]["min"] is None
+    assert result["by_month"] == []
+
+
+def test_analytics_are_cached_by_filters(bff_client):
+    calls = []
+
+    def statement_service(request: httpx.Request) -> httpx.Response:
+        calls.append(dict(request.url.params))
+        skip = int(request.url.params["skip"])
+        return httpx.Response(200, json=STATEMENTS[skip:])
+
+    with bff_client({"statement": httpx.MockTransport(statement_service)}) as client:
+        first = client.get("/api/v1/statements/analytics", params={"min_amount": -1000})
+        second = client.get(
+            "/api/v1/statements/analytics", params={"min_amount": -1000}
+        )
+
+    assert first.status_code == 200
+    assert first.json()["total"]["sum"] == 500
+    assert second.json() == first.json()
+    assert len(calls) == 1
+    assert calls[0]["min_amount"] == "-1000"
+
+
+def test_processing_a_file_drops_cached_analytics(bff_client):
+    calls = []
+
+    def statement_service(request: httpx.Request) -> httpx.Response:
+        calls.append(dict(request.url.params))
+        skip = int(request.url.params["skip"])
+        return httpx.Response(200, json=STATEMENTS[skip:])
+
+    def file_service(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"created": 3})
+
+    with bff_client(
+        {
+            "statement": httpx.MockTransport(statement_service),
+            "file": httpx.MockTransport(file_service),
+        }
+    ) as client:
+        client.get("/api/v1/statements/analytics")
+        processed = client.post("/api/v1/process", json={"file_name": "a.csv"})
+        client.get("/api/v1/statements/analytics")
+
+    assert processed.status_code == 200
+    assert len(calls) == 2
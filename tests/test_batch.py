@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+
+TAGS = [{"id": "5f0c7b4e-2d1a-4c3b-8e9f-0a1b2c3d4e5f", "name": "food", "color": "#f00"}]
+
+
+def test_batch_runs_sub_requests_through_the_app(bff_client):
+    calls = []
+
+    def tag_service(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/api/v1/tags/":
+            return httpx.Response(200, json=TAGS)
+        if request.url.path == "/api/v1/tags/food":
+            return httpx.Response(200, json=TAGS[0])
+        return httpx.Response(404, json={"detail": "Tag not found"})
+
+    with bff_client({"tag": httpx.MockTransport(tag_service)}) as client:
+        response = client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"id": "tags", "path": "/api/v1/tags/"},
+                    {"id": "food", "path": "/api/v1/tags/food"},
+                    {"id": "missing", "path": "/api/v1/tags/missing"},
+                ]
+            },
+        )
+        nested = client.post(
+            "/api/v1/batch",
+            json={"requests": [{"path": "/api/v1/batch", "method": "POST"}]},
+        )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["id"] for result in results] == ["tags", "food", "missing"]
+    assert results[0] == {"id": "tags", "status": 200, "body": TAGS}
+    assert results[1]["body"] == TAGS[0]
+    assert results[2]["status"] == 404
+    assert len(calls) == 3
+    assert nested.status_code == 400
+
+
+def test_batch_rejects_streaming_and_upload_routes(bff_client):
+    with bff_client() as client:
+        responses = [
+            client.post("/api/v1/batch", json={"requests": [sub_request]})
+            for sub_request in (
+                {"path": "/api/v1/statements/export"},
+                {"path": "/api/v1/process/1/events"},
+                {"path": "/api/v1/upload/csv", "method": "POST"},
+                {"path": "/health"},
+            )
+        ]
+
+    assert [response.status_code for response in responses] == [400] * 4
+
+
+def test_slow_sub_request_times_out(bff_client, monkeypatch):
+    monkeypatch.setattr("finances_bff.routes.batch.BATCH_REQUEST_TIMEOUT", 0.1)
+
+    async def tag_service(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v1/tags/slow":
+            await asyncio.sleep(5)
+        return httpx.Response(200, json=TAGS[0])
+
+    with bff_client({"tag": httpx.MockTransport(tag_service)}) as client:
+        response = client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"id": "slow", "path": "/api/v1/tags/slow"},
+                    {"id": "food", "path": "/api/v1/tags/food"},
+                ]
+            },
+        )
+
+    [slow, food] = response.json()["results"]
+    assert slow["status"] == 504
+    assert food == {"id": "food", "status": 200, "body": TAGS[0]}
@@ -0,0 +1,51 @@
+import time
+
+from finances_bff.cache import TTLCache
+
+
+def test_get_counts_hits_and_misses():
+    cache = TTLCache(max_size=10, ttl=60)
+
+    assert cache.get("tags") is None
+    cache.set("tags", [1, 2])
+
+    assert cache.get("tags") == [1, 2]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache(max_size=10, ttl=0.01)
+    cache.set("tags", [1, 2])
+
+    time.sleep(0.02)
+
+    assert cache.get("tags") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_removes_every_entry_in_group():
+    cache = TTLCache(max_size=10, ttl=60)
+    tag = {"id": "1", "name": "food"}
+    cache.set(("tag", "1"), tag, groups=["1", "food"])
+    cache.set(("tag", "food"), tag, groups=["1", "food"])
+    cache.set("other", 1, groups=["2"])
+
+    cache.invalidate("food")
+
+    assert cache.get(("tag", "1")) is None
+    assert cache.get(("tag", "food")) is None
+    assert cache.get("other") == 1
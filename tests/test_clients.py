@@ -0,0 +1,70 @@
+import asyncio
+
+import httpx
+import pytest
+
+from finances_bff.clients import PoolMonitorTransport, ServiceClientSettings
+
+
+def test_settings_are_read_per_service(monkeypatch):
+    monkeypatch.setenv("STATEMENT_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("STATEMENT_READ_TIMEOUT", "2.5")
+    monkeypatch.setenv("STATEMENT_HTTP2", "true")
+    monkeypatch.setenv("TAG_MAX_CONNECTIONS", "3")
+
+    settings = ServiceClientSettings.from_env("statement")
+
+    assert settings.max_connections == 7
+    assert settings.http2 is True
+    assert settings.limits.max_connections == 7
+    assert settings.timeout.read == 2.5
+    assert settings.timeout.connect == ServiceClientSettings().connect_timeout
+    assert ServiceClientSettings.from_env("account") == ServiceClientSettings()
+
+
+class OpenBody(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b"{}"
+
+
+class StreamingTransport(httpx.AsyncBaseTransport):
+    """
+    Return bodies that stay open until the client reads or closes them.
+    """
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/pool-timeout":
+            raise httpx.PoolTimeout("no connection available", request=request)
+        return httpx.Response(200, stream=OpenBody())
+
+
+@pytest.mark.asyncio
+async def test_requests_are_in_flight_until_their_body_is_closed():
+    transport = PoolMonitorTransport(StreamingTransport(), max_connections=2)
+    client = httpx.AsyncClient(transport=transport, base_url="http://statement")
+
+    requests = [client.build_request("GET", "/") for _ in range(3)]
+    responses = await asyncio.gather(
+        *(client.send(request, stream=True) for request in requests)
+    )
+    assert transport.stats()["in_flight"] == 3
+    assert transport.stats()["saturated"] == 1
+
+    for response in responses:
+        await response.aclose()
+    stats = transport.stats()
+    assert stats["in_flight"] == 0
+    assert stats["peak_in_flight"] == 3
+
+
+@pytest.mark.asyncio
+async def test_pool_timeouts_are_counted():
+    transport = PoolMonitorTransport(StreamingTransport(), max_connections=2)
+    client = httpx.AsyncClient(transport=transport, base_url="http://statement")
+
+    with pytest.raises(httpx.PoolTimeout):
+        await client.get("/pool-timeout")
+    await client.get("/")
+
+    assert transport.stats()["pool_timeouts"] == 1
+    assert transport.stats()["in_flight"] == 0
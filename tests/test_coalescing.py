@@ -0,0 +1,81 @@
+import asyncio
+import gzip
+
+import httpx
+import pytest
+
+from finances_bff.coalescing import CoalescingTransport
+
+
+def make_client(handler, max_wait: float = 5.0) -> httpx.AsyncClient:
+    transport = CoalescingTransport(httpx.MockTransport(handler), max_wait=max_wait)
+    return httpx.AsyncClient(transport=transport, base_url="http://statement")
+
+
+def coalesced(client: httpx.AsyncClient) -> int:
+    return client._transport.stats()["coalesced"]
+
+
+@pytest.mark.asyncio
+async def test_identical_gets_share_one_call():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(
+            200,
+            headers={"content-encoding": "gzip"},
+            content=gzip.compress(b'[{"id": 1}]'),
+        )
+
+    client = make_client(handler)
+    responses = await asyncio.gather(
+        client.get("/api/v1/statements/", params={"limit": 10, "skip": 0}),
+        client.get("/api/v1/statements/", params={"skip": 0, "limit": 10}),
+        client.get("/api/v1/statements/", params={"limit": 10, "skip": 0}),
+    )
+
+    assert calls == 1
+    assert [response.json() for response in responses] == [[{"id": 1}]] * 3
+    assert coalesced(client) == 2
+
+
+@pytest.mark.asyncio
+async def test_different_params_and_writes_are_not_shared():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=[])
+
+    client = make_client(handler)
+    await asyncio.gather(
+        client.get("/api/v1/statements/", params={"limit": 10}),
+        client.get("/api/v1/statements/", params={"limit": 20}),
+        client.post("/api/v1/statements/", json={}),
+        client.post("/api/v1/statements/", json={}),
+    )
+
+    assert calls == 4
+
+
+@pytest.mark.asyncio
+async def test_followers_stop_waiting_after_max_wait():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        call = calls
+        await asyncio.sleep(0.2 if call == 1 else 0)
+        return httpx.Response(200, json=call)
+
+    client = make_client(handler, max_wait=0.01)
+    first, second = await asyncio.gather(client.get("/tags/"), client.get("/tags/"))
+
+    assert first.json() == 1
+    assert second.json() == 2
@@ -0,0 +1,104 @@
+import gzip
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+
+from finances_bff.compression import choose_encoding
+from finances_bff.middleware import CompressionMiddleware, ConditionalGetMiddleware
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, encodings=["gzip"], min_size=100)
+
+ROWS = [{"iban": "HU00000000000000000000000000", "color": "#ffffff"}] * 50
+
+
+@app.get("/rows")
+async def rows():
+    return Response(json.dumps(ROWS), media_type="application/json")
+
+
+@app.get("/small")
+async def small():
+    return {"ok": True}
+
+
+@app.get("/stream")
+async def stream():
+    async def chunks():
+        for row in ROWS:
+            yield json.dumps(row).encode() + b"\n"
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+# The order of the BFF: compression outside of the ETag handling.
+etag_app = FastAPI()
+etag_app.add_middleware(ConditionalGetMiddleware)
+etag_app.add_middleware(CompressionMiddleware, encodings=["gzip"], min_size=100)
+etag_app.add_api_route("/rows", rows)
+etag_app.add_api_route("/small", small)
+
+
+def make_client(app: FastAPI = app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bff",
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_large_response_is_compressed():
+    async with make_client() as client:
+        response = await client.get("/rows")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(json.dumps(ROWS))
+    assert response.json() == ROWS
+
+
+@pytest.mark.asyncio
+async def test_small_response_is_not_compressed():
+    async with make_client() as client:
+        response = await client.get("/small")
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_is_compressed_per_chunk():
+    async with make_client() as client:
+        async with client.stream("GET", "/stream") as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).count(b"\n") == len(ROWS)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, compressed", [("/rows", True), ("/small", False)])
+async def test_not_modified_has_the_headers_of_the_response(path, compressed):
+    async with make_client(etag_app) as client:
+        response = await client.get(path)
+        etag = response.headers["etag"]
+        not_modified = await client.get(path, headers={"If-None-Match": etag})
+
+    assert ("content-encoding" in response.headers) is compressed
+    assert etag.startswith("W/") is compressed
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.headers.get("vary") == response.headers.get("vary")
+    assert "content-type" not in not_modified.headers
+
+
+def test_choose_encoding_respects_quality_and_preference():
+    assert choose_encoding("gzip;q=0.5, identity", ["gzip"]) == "gzip"
+    assert choose_encoding("gzip;q=0", ["gzip"]) is None
+    assert choose_encoding("*", ["gzip"]) == "gzip"
+    assert choose_encoding("deflate", ["gzip"]) is None
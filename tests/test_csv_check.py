@@ -0,0 +1,39 @@
+import io
+
+import pytest
+
+from finances_bff.csv_check import CsvCheckError, sniff_csv
+
+
+def test_detects_delimiter_encoding_and_columns():
+    content = "Dátum;Összeg;Leírás\n2025-01-01;-1500;Bolt\n2025-01-02;200;Fizetés\n"
+
+    schema = sniff_csv(io.BytesIO(content.encode("cp1250")), sample_rows=10)
+
+    assert schema.encoding == "cp1250"
+    assert schema.delimiter == ";"
+    assert schema.columns == ["Dátum", "Összeg", "Leírás"]
+    assert schema.rows[1] == ["2025-01-02", "200", "Fizetés"]
+
+
+def test_reads_only_the_head_of_large_files():
+    content = b"date,amount\n" + b"2025-01-01,100\n" * 100_000
+    file = io.BytesIO(content)
+
+    schema = sniff_csv(file, sample_rows=5, max_bytes=1024)
+
+    assert schema.delimiter == ","
+    assert len(schema.rows) == 5
+    assert file.tell() == 0
+
+
+def test_rejects_rows_not_matching_the_header():
+    content = b"date;amount;description\n2025-01-01;100;a\n2025-01-02;200\n"
+
+    with pytest.raises(CsvCheckError, match="Row 3 has 2 columns"):
+        sniff_csv(io.BytesIO(content))
+
+
+def test_rejects_single_column_files():
+    with pytest.raises(CsvCheckError):
+        sniff_csv(io.BytesIO(b"date amount\n2025-01-01 100\n"))
@@ -0,0 +1,76 @@
+import base64
+
+import httpx
+
+# Five days with eight statements each; rows sharing a date come back from
+# the stub in an order unrelated to their ids.
+STATEMENTS = [
+    {
+        "id": f"7d3f5a2e-1c4b-4e8a-9f6d-{day:06d}{i:06d}",
+        "date": f"2025-01-0{day}T00:00:00",
+        "interest_date": f"2025-01-0{day}T00:00:00",
+        "amount": day * 100 + i,
+        "account_iban": "HU00000000000000000000000001",
+        "account_name": "Main",
+    }
+    for day in range(1, 6)
+    for i in range(8)
+]
+
+
+def statement_service(calls: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        calls.append(dict(params))
+        rows = STATEMENTS
+        if "before_date" in params:
+            rows = [row for row in rows if row["date"] <= params["before_date"]]
+        rows = sorted(
+            rows, key=lambda row: (row["date"], row["amount"] * 5 % 8), reverse=True
+        )
+        skip, limit = int(params["skip"]), int(params["limit"])
+        return httpx.Response(200, json=rows[skip : skip + limit])
+
+    return httpx.MockTransport(handler)
+
+
+def test_cursor_pages_cover_every_statement_once(bff_client):
+    calls = []
+
+    with bff_client({"statement": statement_service(calls)}) as client:
+        pages = []
+        cursor = ""
+        while cursor is not None:
+            response = client.get(
+                "/api/v1/statements/", params={"cursor": cursor, "limit": 6}
+            )
+            assert response.status_code == 200
+            pages.append(response.json())
+            cursor = response.headers.get("x-next-cursor")
+        calls_after_listing = len(calls)
+        first_cursor = client.get(
+            "/api/v1/statements/", params={"cursor": "", "limit": 6}
+        ).headers["x-next-cursor"]
+        other_filters = client.get(
+            "/api/v1/statements/",
+            params={"cursor": first_cursor, "limit": 6, "min_amount": 1},
+        )
+        malformed = client.get("/api/v1/statements/", params={"cursor": "x"})
+        bad_date = client.get(
+            "/api/v1/statements/",
+            params={
+                "cursor": base64.urlsafe_b64encode(
+                    b'{"d":"yesterday","i":"1","f":"0"}'
+                ).decode()
+            },
+        )
+
+    ids = [row["id"] for page in pages for row in page]
+    expected = sorted(STATEMENTS, key=lambda row: (row["date"], row["id"]))[::-1]
+    assert ids == [row["id"] for row in expected]
+    assert all(len(page) == 6 for page in pages[:-1])
+    assert calls_after_listing >= len(pages)
+    assert other_filters.status_code == 400
+    assert malformed.status_code == 400
+    assert bad_date.status_code == 400
+    assert bad_date.json()["detail"] == "Invalid cursor"
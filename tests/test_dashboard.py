@@ -0,0 +1,101 @@
+import httpx
+
+ACCOUNTS = [
+    {
+        "id": "0b6c2f0e-8f5d-4a54-9a3c-2f1d0e4b7a11",
+        "name": "Main",
+        "iban": "HU00000000000000000000000001",
+        "nickname": "main",
+        "parent_id": None,
+    }
+]
+STATEMENTS = [
+    {
+        "id": f"7d3f5a2e-1c4b-4e8a-9f6d-00000000000{i}",
+        "date": "2025-01-01T00:00:00",
+        "interest_date": "2025-01-01T00:00:00",
+        "amount": amount,
+        "account_iban": ACCOUNTS[0]["iban"],
+        "account_name": "Main",
+    }
+    for i, amount in enumerate([1000, -300, -200])
+]
+
+
+def test_dashboard_degrades_per_section_and_caches_complete_results(bff_client):
+    tag_service_up = False
+    statement_calls = []
+
+    def account_service(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=ACCOUNTS)
+
+    def tag_service(request: httpx.Request) -> httpx.Response:
+        if not tag_service_up:
+            return httpx.Response(500, json={"detail": "down"})
+        return httpx.Response(200, json=[])
+
+    def statement_service(request: httpx.Request) -> httpx.Response:
+        statement_calls.append(dict(request.url.params))
+        return httpx.Response(200, json=STATEMENTS)
+
+    with bff_client(
+        {
+            "account": httpx.MockTransport(account_service),
+            "statement": httpx.MockTransport(statement_service),
+            "tag": httpx.MockTransport(tag_service),
+        }
+    ) as client:
+        degraded = client.get("/api/v1/dashboard", params={"limit": 3})
+        tag_service_up = True
+        complete = client.get("/api/v1/dashboard", params={"limit": 3})
+        calls_before_cached = len(statement_calls)
+        cached = client.get("/api/v1/dashboard", params={"limit": 3})
+
+    assert degraded.status_code == 200
+    body = degraded.json()
+    assert body["tags"] is None
+    assert set(body["errors"]) == {"tags"}
+    assert body["accounts"][0]["iban"] == ACCOUNTS[0]["iban"]
+    assert len(body["recent_statements"]) == 3
+    summary = body["summary"]
+    assert (summary["income"], summary["expenses"], summary["net"]) == (
+        1000,
+        -500,
+        500,
+    )
+
+    assert complete.json()["errors"] == {}
+    assert complete.json()["tags"] == []
+    assert cached.json() == complete.json()
+    assert len(statement_calls) == calls_before_cached
+
+
+def test_section_with_an_invalid_body_is_an_error(bff_client):
+    def account_service(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=ACCOUNTS)
+
+    def tag_service(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=[])
+
+    def statement_service(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, text="<html>maintenance</html>", headers={"content-type": "text/html"}
+        )
+
+    with bff_client(
+        {
+            "account": httpx.MockTransport(account_service),
+            "statement": httpx.MockTransport(statement_service),
+            "tag": httpx.MockTransport(tag_service),
+        }
+    ) as client:
+        response = client.get("/api/v1/dashboard")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["recent_statements"] is None
+    assert body["summary"] is None
+    assert set(body["errors"]) == {"recent_statements", "summary"}
+    assert body["errors"]["summary"].startswith("Statement service sent an invalid")
+    assert body["accounts"][0]["iban"] == ACCOUNTS[0]["iban"]
+    assert body["tags"] == []
@@ -0,0 +1,75 @@
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+
+from finances_bff.middleware import ConditionalGetMiddleware
+from finances_bff.proxy import Payload, etag_matches
+
+app = FastAPI()
+app.add_middleware(ConditionalGetMiddleware)
+
+
+@app.get("/items")
+async def items():
+    return [{"id": 1}]
+
+
+@app.get("/payload")
+async def payload():
+    return Response(b"[]", headers={"ETag": Payload.from_data([]).etag})
+
+
+@app.get("/stream")
+async def stream():
+    async def chunks():
+        yield b"a"
+        yield b"b"
+
+    return StreamingResponse(chunks())
+
+
+def make_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bff"
+    )
+
+
+@pytest.mark.asyncio
+async def test_matching_etag_returns_not_modified():
+    async with make_client() as client:
+        response = await client.get("/items")
+        etag = response.headers["etag"]
+        cached = await client.get("/items", headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert "content-length" not in cached.headers
+
+
+@pytest.mark.asyncio
+async def test_route_etag_is_kept():
+    etag = Payload.from_data([]).etag
+
+    async with make_client() as client:
+        response = await client.get("/payload")
+        cached = await client.get("/payload", headers={"If-None-Match": f"W/{etag}"})
+
+    assert response.headers["etag"] == etag
+    assert cached.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_has_no_etag():
+    async with make_client() as client:
+        response = await client.get("/stream")
+
+    assert response.content == b"ab"
+    assert "etag" not in response.headers
+
+
+def test_etag_matches_lists_and_wildcard():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
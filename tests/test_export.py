@@ -0,0 +1,71 @@
+import csv
+import io
+
+import httpx
+import orjson
+import pytest
+
+from finances_bff.paging import iter_statement_pages
+
+STATEMENTS = [
+    {
+        "id": f"7d3f5a2e-1c4b-4e8a-9f6d-{i:012d}",
+        "date": "2025-01-01T00:00:00",
+        "interest_date": "2025-01-01T00:00:00",
+        "amount": i,
+        "account_iban": "HU00000000000000000000000001",
+        "account_name": "Main",
+        "description": 'quoted "text", with comma',
+        "tags": [{"id": "5f0c7b4e-2d1a-4c3b-8e9f-0a1b2c3d4e5f", "name": "food"}],
+    }
+    for i in range(25)
+]
+
+
+def statement_service(calls: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        calls.append(dict(params))
+        skip, limit = int(params["skip"]), int(params["limit"])
+        return httpx.Response(200, json=STATEMENTS[skip : skip + limit])
+
+    return httpx.MockTransport(handler)
+
+
+def test_export_streams_every_page(bff_client, monkeypatch):
+    monkeypatch.setattr("finances_bff.routes.statement.STATEMENT_EXPORT_PAGE_SIZE", 10)
+    calls = []
+
+    with bff_client({"statement": statement_service(calls)}) as client:
+        ndjson = client.get(
+            "/api/v1/statements/export", params={"account_iban": "HU01"}
+        )
+        exported_csv = client.get("/api/v1/statements/export", params={"format": "csv"})
+
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    lines = ndjson.content.splitlines()
+    assert [orjson.loads(line)["amount"] for line in lines] == list(range(25))
+    assert [call["skip"] for call in calls[:3]] == ["0", "10", "20"]
+    assert all(call["account_iban"] == "HU01" for call in calls[:3])
+
+    rows = list(csv.reader(io.StringIO(exported_csv.text)))
+    assert rows[0][:4] == ["id", "date", "interest_date", "amount"]
+    assert len(rows) == 26
+    assert rows[1][8] == STATEMENTS[0]["description"]
+    assert rows[1][9] == "food"
+
+
+@pytest.mark.asyncio
+async def test_pages_stop_when_the_caller_stops():
+    calls = []
+    async with httpx.AsyncClient(
+        transport=statement_service(calls), base_url="http://statement"
+    ) as client:
+        pages = iter_statement_pages(client, {}, 10)
+        first_page = await anext(pages)
+        await pages.aclose()
+
+    assert len(first_page) == 10
+    # The second page was prefetched, the third never requested.
+    assert len(calls) <= 2
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from finances_bff.routes.health import HealthSnapshot, check_service, health_check
+
+
+def make_client(delay: float = 0.0, status_code: int = 200) -> httpx.AsyncClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        return httpx.Response(status_code, json={"status": "ok"})
+
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://service"
+    )
+
+
+@pytest.mark.asyncio
+async def test_check_service_reports_timeout():
+    result = await check_service("Tag", make_client(delay=1.0), timeout=0.05)
+
+    assert result["status"] == "error"
+    assert "did not respond" in result["message"]
+    assert result["latency_ms"] < 1000
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [b"OK", b"[]", b"null"])
+async def test_check_service_reports_invalid_body(body):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body)
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://service"
+    )
+    result = await check_service("Tag", client, timeout=1)
+
+    assert result["status"] == "error"
+    assert result["message"].startswith("Tag service sent an invalid health response")
+
+
+@pytest.mark.asyncio
+async def test_health_check_runs_services_concurrently():
+    snapshot = HealthSnapshot()
+    start_time = time.perf_counter()
+
+    result = await health_check(
+        make_client(delay=0.1),
+        make_client(delay=0.1),
+        make_client(delay=0.1),
+        make_client(status_code=500),
+        snapshot,
+    )
+
+    assert time.perf_counter() - start_time < 0.3
+    assert result["services"]["account_service"]["status"] == "ok"
+    assert result["services"]["tag_service"]["status_code"] == 500
+    assert all("latency_ms" in service for service in result["services"].values())
+
+
+@pytest.mark.asyncio
+async def test_health_check_reuses_snapshot():
+    snapshot = HealthSnapshot()
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"status": "ok"})
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://service"
+    )
+
+    results = await asyncio.gather(
+        *(health_check(client, client, client, client, snapshot) for _ in range(5))
+    )
+    await health_check(client, client, client, client, snapshot)
+
+    assert calls == 4
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from finances_bff.jobs import Job, JobFailedError, JobLimitError, JobManager, job_events
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_with_bounded_concurrency():
+    manager = JobManager(max_concurrency=2, ttl=60, max_jobs=100)
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "done"
+
+    jobs = [manager.submit(work) for _ in range(5)]
+    await asyncio.sleep(0.1)
+
+    assert peak == 2
+    assert [job.status for job in jobs] == [Job.SUCCEEDED] * 5
+    assert manager.get(jobs[0].id).to_dict()["result"] == "done"
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_expire_after_ttl():
+    manager = JobManager(max_concurrency=1, ttl=0.2, max_jobs=100)
+
+    async def fail():
+        raise JobFailedError(502, "Bad gateway")
+
+    job = manager.submit(fail)
+    while not job.done:
+        await job.wait_for_change(1)
+    assert manager.get(job.id).error == {"status_code": 502, "detail": "Bad gateway"}
+
+    await asyncio.sleep(0.3)
+    assert manager.get(job.id) is None
+
+
+@pytest.mark.asyncio
+async def test_submit_is_refused_when_no_kept_job_is_finished():
+    manager = JobManager(max_concurrency=1, ttl=60, max_jobs=2)
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+
+    jobs = [manager.submit(work), manager.submit(work)]
+    with pytest.raises(JobLimitError):
+        manager.submit(work)
+
+    release.set()
+    while not all(job.done for job in jobs):
+        await jobs[-1].wait_for_change(1)
+    # A finished job is dropped to make room for the new one.
+    manager.submit(work)
+    assert manager.get(jobs[0].id) is None
+
+
+@pytest.mark.asyncio
+async def test_events_follow_status_changes():
+    manager = JobManager(max_concurrency=1, ttl=60, max_jobs=100)
+
+    async def work():
+        await asyncio.sleep(0.01)
+
+    job = manager.submit(work)
+    events = [event async for event in job_events(job, keepalive=5)]
+
+    assert [event.split("\n")[0] for event in events] == [
+        "event: queued",
+        "event: running",
+        "event: succeeded",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_events_end_on_the_final_event_with_a_slow_consumer():
+    manager = JobManager(max_concurrency=1, ttl=60, max_jobs=100)
+
+    async def work():
+        return "done"
+
+    job = manager.submit(work)
+    events = []
+    async for event in job_events(job, keepalive=5):
+        events.append(event)
+        # The job finishes while this event is still being handled.
+        await asyncio.sleep(0.05)
+
+    assert events[0].startswith("event: queued")
+    assert events[-1].startswith("event: succeeded")
+    assert '"result":"done"' in events[-1]
@@ -1,10 +1,20 @@
-from fastapi.testclient import TestClient
-from project.main import app
+import httpx
 
-client = TestClient(app)
+from finances_bff.clients import SERVICES
 
 
-def test_health_check():
-    response = client.get("/health")
+def health_stub(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"status": "ok"})
+
+
+def test_health_check(bff_client):
+    transports = {service: httpx.MockTransport(health_stub) for service in SERVICES}
+
+    with bff_client(transports) as client:
+        response = client.get("/health")
+
     assert response.status_code == 200
-    assert response.json() == {"status": "ok"}
+    assert response.json()["status"] == "ok"
+    assert set(response.json()["services"]) == {
+        f"{service}_service" for service in SERVICES
+    }
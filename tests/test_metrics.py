@@ -0,0 +1,51 @@
+import httpx
+import pytest
+
+from finances_bff import metrics
+from finances_bff.metrics import MetricsTransport, Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.histogram("latency", "Latency.", ("route",), (0.1, 1.0))
+    histogram.observe("/a", value=0.05)
+    histogram.observe("/a", value=0.5)
+    histogram.observe("/a", value=5)
+
+    text = registry.render()
+
+    assert 'latency_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_count{route="/a"} 3' in text
+
+
+def test_downstream_calls_are_labelled_with_the_calling_route(bff_client):
+    def tag_service(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"id": "1", "name": "food"})
+
+    with bff_client({"tag": httpx.MockTransport(tag_service)}) as client:
+        client.get("/api/v1/tags/groceries-2025")
+        client.get("/api/v1/tags/rent")
+
+    routes = {labels[2] for labels in metrics.downstream_requests._values}
+    assert "/api/v1/tags/{tag_id_or_name}" in routes
+    assert not any("groceries" in route or "rent" in route for route in routes)
+
+
+@pytest.mark.asyncio
+async def test_metrics_transport_counts_errors():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    transport = MetricsTransport(httpx.MockTransport(handler), "metrics-test")
+    async with httpx.AsyncClient(base_url="http://x", transport=transport) as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.get("/items/1")
+
+    assert (
+        metrics.downstream_errors._values[
+            ("metrics-test", "GET", "background", "ConnectError")
+        ]
+        == 1
+    )
@@ -0,0 +1,62 @@
+import asyncio
+
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from finances_bff.main import app
+
+# A bare app behind the same middleware stack as the real one.
+stack_app = FastAPI()
+stack_app.user_middleware = list(app.user_middleware)
+background_runs = []
+
+
+@stack_app.get("/boom")
+async def boom():
+    raise RuntimeError("boom")
+
+
+@stack_app.get("/stream")
+async def stream():
+    async def chunks():
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield f"chunk {i}\n"
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+@stack_app.get("/background")
+async def background(background_tasks: BackgroundTasks):
+    background_tasks.add_task(background_runs.append, "ran")
+    return {"status": "accepted"}
+
+
+def test_unhandled_exception_becomes_json_500():
+    with TestClient(stack_app) as client:
+        response = client.get("/boom")
+
+    assert response.status_code == 500
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"error": "Internal Server Error"}
+
+
+def test_streaming_response_passes_through_the_stack():
+    with TestClient(stack_app) as client:
+        with client.stream(
+            "GET", "/stream", headers={"accept-encoding": "identity"}
+        ) as response:
+            chunks = list(response.iter_lines())
+
+    assert response.status_code == 200
+    assert chunks == ["chunk 0", "chunk 1", "chunk 2"]
+
+
+def test_background_tasks_run_after_the_response():
+    background_runs.clear()
+    with TestClient(stack_app) as client:
+        response = client.get("/background")
+
+    assert response.json() == {"status": "accepted"}
+    assert background_runs == ["ran"]
@@ -0,0 +1,72 @@
+import httpx
+import orjson
+import pytest
+
+from finances_bff.config import env_list
+
+TAG = {
+    "id": "5f0c7b4e-2d1a-4c3b-8e9f-0a1b2c3d4e5f",
+    "name": "food",
+    "color": "#f00",
+    "created_by": "import",
+}
+# Spacing and a field the response model does not have, both of which would
+# be lost if the body were parsed and serialized again.
+TAGS_BODY = b'[ {"id": "5f0c7b4e-2d1a-4c3b-8e9f-0a1b2c3d4e5f", "name": "food",\n'
+TAGS_BODY += b'"color": "#f00", "created_by": "import"} ]'
+CONTENT_TYPE = "application/json; charset=utf-8"
+
+
+def tag_service(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/api/v1/tags/":
+        return httpx.Response(
+            200, content=TAGS_BODY, headers={"content-type": CONTENT_TYPE}
+        )
+    return httpx.Response(200, json=TAG)
+
+
+def get_tags(
+    bff_client, monkeypatch, routes: list[str]
+) -> tuple[httpx.Response, httpx.Response]:
+    monkeypatch.setattr("finances_bff.proxy.PASSTHROUGH_ROUTES", routes)
+
+    with bff_client({"tag": httpx.MockTransport(tag_service)}) as client:
+        tags = client.get("/api/v1/tags/")
+        tag = client.get("/api/v1/tags/food")
+    return tags, tag
+
+
+def test_listed_routes_forward_the_downstream_body(bff_client, monkeypatch):
+    tags, tag = get_tags(bff_client, monkeypatch, ["read_tags"])
+
+    assert tags.content == TAGS_BODY
+    assert tags.headers["content-type"] == CONTENT_TYPE
+    # read_tag is not listed, so its body is validated against TagOut.
+    assert tag.json() == {key: TAG[key] for key in ("id", "name", "color")}
+
+
+@pytest.mark.parametrize("routes", [["*"], ["read_tags", "read_tag"]])
+def test_every_listed_route_passes_through(bff_client, monkeypatch, routes):
+    tags, tag = get_tags(bff_client, monkeypatch, routes)
+
+    assert tags.content == TAGS_BODY
+    assert tag.json() == TAG
+
+
+def test_empty_setting_disables_pass_through(bff_client, monkeypatch):
+    tags, tag = get_tags(bff_client, monkeypatch, [])
+
+    assert orjson.loads(tags.content) == [
+        {key: TAG[key] for key in ("id", "name", "color")}
+    ]
+    assert tags.headers["content-type"] == "application/json"
+    assert "created_by" not in tag.json()
+
+
+@pytest.mark.parametrize(
+    "value, routes", [("", []), (" read_tags, read_tag ,", ["read_tags", "read_tag"])]
+)
+def test_setting_is_read_as_route_names(monkeypatch, value, routes):
+    monkeypatch.setenv("PASSTHROUGH_ROUTES", value)
+
+    assert env_list("PASSTHROUGH_ROUTES", ["*"]) == routes
@@ -0,0 +1,29 @@
+from unittest import mock
+
+from finances_bff.request_log import filter_headers, should_log
+
+
+def test_excluded_paths_are_never_logged():
+    assert not should_log("/health", 500, 10.0)
+
+
+def test_errors_and_slow_requests_are_always_logged():
+    with mock.patch("finances_bff.request_log.random.random", return_value=0.99):
+        assert should_log("/api/v1/tags/", 503, 0.01)
+        assert should_log("/api/v1/tags/", 200, 10.0)
+        assert not should_log("/api/v1/tags/", 200, 0.01)
+
+
+def test_filter_headers_keeps_allowlist_and_redacts_credentials():
+    with mock.patch(
+        "finances_bff.request_log._allowed_headers", {"user-agent", "authorization"}
+    ):
+        headers = filter_headers(
+            [
+                (b"user-agent", b"pytest"),
+                (b"authorization", b"Bearer secret"),
+                (b"x-forwarded-for", b"10.0.0.1"),
+            ]
+        )
+
+    assert headers == {"user-agent": "pytest", "authorization": "[REDACTED]"}
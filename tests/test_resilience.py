@@ -0,0 +1,113 @@
+import httpx
+import pytest
+
+from finances_bff.resilience import CircuitBreaker, ResilienceTransport
+
+
+def make_client(handler, **kwargs) -> tuple[httpx.AsyncClient, ResilienceTransport]:
+    transport = ResilienceTransport(
+        httpx.MockTransport(handler), retry_backoff=0.001, **kwargs
+    )
+    return httpx.AsyncClient(transport=transport, base_url="http://tag"), transport
+
+
+@pytest.mark.asyncio
+async def test_gets_are_retried_on_unavailable_responses():
+    statuses = [503, 502, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(statuses.pop(0))
+
+    client, transport = make_client(handler, retry_attempts=2)
+    response = await client.get("/api/v1/tags/")
+
+    assert response.status_code == 200
+    assert transport.stats()["retries"] == 2
+    assert transport.stats()["breaker_state"] == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_writes_are_not_retried():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        raise httpx.ConnectError("refused", request=request)
+
+    client, _ = make_client(handler, retry_attempts=2)
+    with pytest.raises(httpx.ConnectError):
+        await client.post("/api/v1/tags/", json={})
+
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        raise httpx.ConnectError("refused", request=request)
+
+    client, transport = make_client(handler, retry_attempts=0, failure_threshold=2)
+    for _ in range(4):
+        with pytest.raises(httpx.RequestError):
+            await client.get("/api/v1/tags/")
+
+    assert calls == 2
+    assert transport.stats()["breaker_state"] == CircuitBreaker.OPEN
+    assert transport.stats()["rejected_open"] == 2
+
+
+def test_half_open_breaker_allows_one_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+class Body(httpx.AsyncByteStream):
+    def __init__(self, fail: bool):
+        self.fail = fail
+
+    async def __aiter__(self):
+        yield b"["
+        if self.fail:
+            raise httpx.ReadTimeout("timed out")
+        yield b"]"
+
+
+class StreamingTransport(httpx.AsyncBaseTransport):
+    """
+    Return bodies that are only read when the client reads them, unlike
+    MockTransport, which reads them before returning.
+    """
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=Body(fail=request.url.path == "/fail"))
+
+
+@pytest.mark.asyncio
+async def test_slot_and_outcome_wait_for_the_body():
+    transport = ResilienceTransport(
+        StreamingTransport(), retry_attempts=0, failure_threshold=1
+    )
+    client = httpx.AsyncClient(transport=transport, base_url="http://tag")
+
+    async with client.stream("GET", "/api/v1/tags/") as response:
+        assert transport.stats()["active"] == 1
+        assert await response.aread() == b"[]"
+    assert transport.stats()["active"] == 0
+
+    with pytest.raises(httpx.ReadTimeout):
+        await client.get("/fail")
+
+    assert transport.stats()["active"] == 0
+    assert transport.stats()["breaker_state"] == CircuitBreaker.OPEN
@@ -0,0 +1,35 @@
+import httpx
+import pytest
+
+import finances_bff.proxy as proxy
+
+STATEMENT = {
+    "id": "0b7e6a4c-8e1b-4f43-9a4e-2f9c7d3a1b55",
+    "date": "2025-03-01T12:30:00+01:00",
+    "interest_date": "2025-03-02T00:00:00",
+    "amount": -1500,
+    "account_iban": "HU00000000000000000000000001",
+    "account_name": "Main",
+    "tags": [
+        {"id": "5f0c7b4e-2d1a-4c3b-8e9f-0a1b2c3d4e5f", "name": "food", "color": "#f00"}
+    ],
+}
+
+
+def statement_stub(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=[STATEMENT])
+
+
+@pytest.mark.parametrize("validate", [False, True])
+def test_statements_encode_datetimes_and_uuids(bff_client, monkeypatch, validate):
+    monkeypatch.setattr(proxy, "VALIDATE_RESPONSES", validate)
+
+    with bff_client({"statement": httpx.MockTransport(statement_stub)}) as client:
+        response = client.get("/api/v1/statements/")
+
+    assert response.status_code == 200
+    statement = response.json()[0]
+    assert statement["id"] == STATEMENT["id"]
+    assert statement["date"] == STATEMENT["date"]
+    assert statement["interest_date"] == STATEMENT["interest_date"]
+    assert statement["tags"] == STATEMENT["tags"]
@@ -0,0 +1,27 @@
+import httpx
+
+TAG = {"id": "5f0c7b4e-2d1a-4c3b-8e9f-0a1b2c3d4e5f", "name": "food", "color": "#f00"}
+
+
+def test_malformed_tag_list_is_not_cached(bff_client):
+    bodies = [
+        httpx.Response(200, text="<html>maintenance</html>"),
+        httpx.Response(200, json=[{"name": "food"}]),
+        httpx.Response(200, json=[TAG]),
+    ]
+
+    def tag_service(request: httpx.Request) -> httpx.Response:
+        return bodies.pop(0)
+
+    with bff_client({"tag": httpx.MockTransport(tag_service)}) as client:
+        client.raise_server_exceptions = False
+        not_json = client.get("/api/v1/tags/")
+        missing_id = client.get("/api/v1/tags/")
+        tags = client.get("/api/v1/tags/")
+        tag = client.get("/api/v1/tags/food")
+
+    assert not_json.status_code == 500
+    assert missing_id.status_code == 500
+    assert tags.json() == [TAG]
+    assert tag.json() == TAG
+    assert bodies == []
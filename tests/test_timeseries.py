@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+
+import httpx
+
+from finances_bff.timeseries import StatementTimeSeries, lttb
+
+
+def statement(day: date, amount: int, account: str = "HU01") -> dict:
+    return {
+        "date": f"{day.isoformat()}T12:00:00",
+        "amount": amount,
+        "account_iban": account,
+    }
+
+
+def test_buckets_fill_gaps_and_track_the_balance():
+    timeseries = StatementTimeSeries("week")
+    timeseries.add_page(
+        [
+            statement(date(2025, 1, 1), 100),
+            statement(date(2025, 1, 3), -30),
+            statement(date(2025, 1, 20), 50),
+            statement(date(2025, 1, 2), 7, "HU02"),
+        ]
+    )
+
+    [first, second] = timeseries.series("amount")
+    assert first["account_iban"] == "HU01"
+    assert [(point["date"], point["value"]) for point in first["points"]] == [
+        (date(2024, 12, 30), 70),
+        (date(2025, 1, 6), 0),
+        (date(2025, 1, 13), 0),
+        (date(2025, 1, 20), 50),
+    ]
+    assert second["points"][0]["count"] == 1
+
+    balance = timeseries.series("balance")[0]["points"]
+    assert [point["value"] for point in balance] == [70, 70, 70, 120]
+
+
+def test_point_budget_keeps_totals_and_peaks():
+    start = date(2020, 1, 1)
+    timeseries = StatementTimeSeries("day")
+    timeseries.add_page(
+        [
+            statement(start + timedelta(days=i), 1 if i != 700 else 5000)
+            for i in range(2000)
+        ]
+    )
+
+    amounts = timeseries.series("amount", max_points=100)[0]["points"]
+    assert len(amounts) <= 100
+    assert sum(point["value"] for point in amounts) == 1999 + 5000
+
+    balance = timeseries.series("balance", max_points=100)[0]["points"]
+    assert len(balance) == 100
+    assert balance[-1]["value"] == 1999 + 5000
+    assert lttb([0, 0, 9, 0, 0, 1, 0], 3) == [0, 2, 6]
+
+
+def test_timeseries_route(bff_client):
+    statements = [
+        statement(date(2025, 1, 1) + timedelta(days=i), 10) for i in range(90)
+    ]
+
+    def statement_service(request: httpx.Request) -> httpx.Response:
+        skip = int(request.url.params["skip"])
+        limit = int(request.url.params["limit"])
+        return httpx.Response(200, json=statements[skip : skip + limit])
+
+    with bff_client({"statement": httpx.MockTransport(statement_service)}) as client:
+        response = client.get(
+            "/api/v1/statements/timeseries",
+            params={"bucket": "month", "metric": "balance"},
+        )
+        too_many = client.get(
+            "/api/v1/statements/timeseries", params={"max_points": 10**9}
+        )
+
+    assert response.status_code == 200
+    points = response.json()["series"][0]["points"]
+    assert [point["date"] for point in points] == [
+        "2025-01-01",
+        "2025-02-01",
+        "2025-03-01",
+    ]
+    assert points[-1]["value"] == 900
+    assert too_many.status_code == 422
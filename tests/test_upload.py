@@ -0,0 +1,137 @@
+import io
+
+import httpx
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from finances_bff.upload import (
+    MultipartUploadStream,
+    UploadTooLargeError,
+    forward_upload,
+)
+
+
+def make_upload(content: bytes, filename: str = "export.csv") -> UploadFile:
+    return UploadFile(
+        io.BytesIO(content),
+        size=len(content),
+        filename=filename,
+        headers=Headers({"content-type": "text/csv"}),
+    )
+
+
+@pytest.mark.asyncio
+async def test_forward_upload_streams_multipart_body():
+    content = b"date;amount\n" * 1000
+    received = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received["headers"] = request.headers
+        received["body"] = request.content
+        return httpx.Response(200)
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://file"
+    ) as client:
+        response = await forward_upload(
+            client, "/api/v1/upload/csv", "csv_file", make_upload(content)
+        )
+
+    assert response.status_code == 200
+    body = received["body"]
+    assert int(received["headers"]["content-length"]) == len(body)
+    assert received["headers"]["content-type"].startswith("multipart/form-data")
+    assert b'name="csv_file"; filename="export.csv"' in body
+    assert content in body
+
+
+@pytest.mark.asyncio
+async def test_stream_reads_in_chunks():
+    stream = MultipartUploadStream("csv_file", make_upload(b"x" * 100), chunk_size=30)
+
+    chunks = [chunk async for chunk in stream]
+
+    assert [len(chunk) for chunk in chunks[1:-1]] == [30, 30, 30, 10]
+
+
+@pytest.mark.asyncio
+async def test_stream_enforces_max_size():
+    upload = make_upload(b"x" * 100)
+    upload.size = None
+    stream = MultipartUploadStream("csv_file", upload, chunk_size=30, max_size=50)
+
+    with pytest.raises(UploadTooLargeError):
+        _ = [chunk async for chunk in stream]
+
+
+def test_known_size_is_rejected_before_sending():
+    stream = MultipartUploadStream("csv_file", make_upload(b"x" * 100), max_size=50)
+
+    with pytest.raises(UploadTooLargeError):
+        stream.check_size()
+
+
+def test_bulk_upload_reports_each_file(bff_client):
+    received = []
+
+    async def file_service(request: httpx.Request) -> httpx.Response:
+        received.append(request.url.path)
+        if b"broken" in await request.aread():
+            return httpx.Response(422)
+        return httpx.Response(200)
+
+    with bff_client({"file": httpx.MockTransport(file_service)}) as client:
+        response = client.post(
+            "/api/v1/upload/bulk",
+            files=[
+                ("files", ("a.csv", b"date;amount\n", "text/csv")),
+                ("files", ("b.zip", b"PK", "application/zip")),
+                ("files", ("c.csv", b"date;amount\nbroken;1\n", "text/csv")),
+                ("files", ("d.txt", b"text", "text/plain")),
+            ],
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["uploaded"], body["failed"]) == (2, 2)
+    assert [(f["file_name"], f["status_code"]) for f in body["files"]] == [
+        ("a.csv", 200),
+        ("b.zip", 200),
+        ("c.csv", 422),
+        ("d.txt", 400),
+    ]
+    assert sorted(received) == [
+        "/api/v1/upload/csv",
+        "/api/v1/upload/csv",
+        "/api/v1/upload/zip",
+    ]
+
+
+def test_repeated_upload_is_deduplicated(bff_client):
+    received = []
+
+    async def file_service(request: httpx.Request) -> httpx.Response:
+        received.append(await request.aread())
+        return httpx.Response(200)
+
+    csv_file = {"csv_file": ("a.csv", b"date;amount\n2025-01-01;100\n", "text/csv")}
+    with bff_client({"file": httpx.MockTransport(file_service)}) as client:
+        first = client.post("/api/v1/upload/csv", files=csv_file)
+        second = client.post("/api/v1/upload/csv", files=csv_file)
+        forced = client.post("/api/v1/upload/csv?force=true", files=csv_file)
+        other_caller = client.post(
+            "/api/v1/upload/csv",
+            files=csv_file,
+            headers={"Authorization": "Bearer other"},
+        )
+
+    assert first.json()["deduplicated"] is False
+    assert second.json()["deduplicated"] is True
+    assert second.json()["previous_upload"]["file_name"] == "a.csv"
+    assert forced.json()["deduplicated"] is False
+    assert other_caller.json() == {
+        "message": "CSV file uploaded successfully",
+        "deduplicated": False,
+    }
+    assert len(received) == 3